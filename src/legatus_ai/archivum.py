@@ -1,25 +1,74 @@
 import sqlite3
 import logging
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Tuple, Any, Set
+from typing import List, Dict, Tuple, Any, Set, Iterator, Optional
+
+logger = logging.getLogger(__name__)
 
 # --- Schema Definition ---
 TABLE_NAME = "articles"
-SCHEMA = f"""
-    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+# WITHOUT ROWID stores rows in the primary key b-tree itself, so lookups by
+# link are answered from the key index with no extra table fetch.
+_SCHEMA_TEMPLATE = """
+    CREATE TABLE IF NOT EXISTS {table} (
         link TEXT PRIMARY KEY,
         title TEXT NOT NULL,
         criticality_score INTEGER,
         reported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
+    ) WITHOUT ROWID
 """
+SCHEMA = _SCHEMA_TEMPLATE.format(table=TABLE_NAME)
+# Stored in PRAGMA user_version once the schema above (and any migration to it)
+# is in place. Bump it whenever the schema or a migration changes.
+SCHEMA_VERSION = 1
+# Per-connection scratch table holding the links checked by filter_new_articles.
+CANDIDATE_LINKS_TABLE = "candidate_links"
+CANDIDATE_LINKS_SCHEMA = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {CANDIDATE_LINKS_TABLE} (link TEXT PRIMARY KEY) WITHOUT ROWID"
+)
+
+# --- Queries ---
+# sqlite3 caches prepared statements per connection, keyed on the SQL text, so
+# every query is a fixed string and never rebuilt per call.
+CLEAR_CANDIDATE_LINKS = f"DELETE FROM {CANDIDATE_LINKS_TABLE}"
+INSERT_CANDIDATE_LINK = f"INSERT OR IGNORE INTO {CANDIDATE_LINKS_TABLE} (link) VALUES (?)"
+NEW_LINKS_QUERY = (
+    f"SELECT c.link FROM {CANDIDATE_LINKS_TABLE} c "
+    f"LEFT JOIN {TABLE_NAME} a ON a.link = c.link WHERE a.link IS NULL"
+)
+# Largest multi-row INSERT. Older SQLite builds cap bound parameters at 999 and
+# every archived row binds 3 of them. Smaller batches are powers of two, so only
+# a handful of distinct INSERT statements are ever prepared.
+INSERT_BATCH_SIZE = 256
+
+# Applied once when a connection is opened, not on every archive call.
+# WAL lets the Inquisitor read while Legatus writes and, with synchronous=NORMAL,
+# avoids an fsync of a rollback journal on every commit. mmap serves reads from
+# mapped pages instead of a read() syscall per page.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-64000",  # ~64 MB page cache
+)
 # A simple type alias for clarity
 AnalysisResult = Dict[str, Any]
 
+# --- Connection Caching ---
+# Every archive call used to open (and leak) its own connection. We keep one
+# connection per database file for the lifetime of the process instead.
+_connection_cache: Dict[Path, sqlite3.Connection] = {}
+
 
 def get_db_connection(db_path: Path) -> sqlite3.Connection:
     """
-    Establishes a connection to the SQLite database.
+    Returns the shared connection to the SQLite database, opening it on first use.
+
+    The connection is used as a transaction context manager by the callers
+    (``with conn:``), which commits or rolls back but does not close it.
 
     Args:
         db_path: The path to the SQLite database file.
@@ -30,21 +79,66 @@ def get_db_connection(db_path: Path) -> sqlite3.Connection:
     Raises:
         sqlite3.Error: If a connection cannot be established.
     """
+    if (conn := _connection_cache.get(db_path)) is not None:
+        return conn
+
     try:
         # The parent directory will be created if it doesn't exist.
         db_path.parent.mkdir(parents=True, exist_ok=True)
         conn = sqlite3.connect(db_path, check_same_thread=False)
-        logging.info(f"Database connection established at '{db_path}'")
-        return conn
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        logger.info("Database connection established at '%s'", db_path)
     except sqlite3.Error as e:
-        logging.error(f"Database connection error at '{db_path}': {e}")
+        logger.error("Database connection error at '%s': %s", db_path, e)
         raise
 
+    _connection_cache[db_path] = conn
+    return conn
+
+
+def close_db_connections():
+    """Closes every cached database connection. Safe to call more than once."""
+    while _connection_cache:
+        db_path, conn = _connection_cache.popitem()
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Error while closing database connection at '%s': %s", db_path, e)
+
+
+def _migrate_to_without_rowid(conn: sqlite3.Connection):
+    """
+    Rebuilds an archive created by older versions as a WITHOUT ROWID table.
+
+    Does nothing if the table does not exist yet or has already been migrated.
+    Rows without a link cannot be keyed and are dropped during the copy.
+    """
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE_NAME,)
+    ).fetchone()
+    if row is None or "WITHOUT ROWID" in row[0].upper():
+        return
+
+    logger.info("Migrating database table '%s' to a WITHOUT ROWID layout...", TABLE_NAME)
+    migration_table = f"{TABLE_NAME}_migration"
+    columns = "link, title, criticality_score, reported_at"
+    conn.execute("BEGIN")
+    with conn:
+        conn.execute(f"DROP TABLE IF EXISTS {migration_table}")
+        conn.execute(_SCHEMA_TEMPLATE.format(table=migration_table))
+        conn.execute(f"INSERT OR IGNORE INTO {migration_table} ({columns}) SELECT {columns} FROM {TABLE_NAME}")
+        conn.execute(f"DROP TABLE {TABLE_NAME}")
+        conn.execute(f"ALTER TABLE {migration_table} RENAME TO {TABLE_NAME}")
+
 
 def initialize_database(db_path: Path):
     """
     Creates the database and the articles table if they don't exist.
 
+    Archives created by older versions are migrated to the current layout.
+    Once a database is at SCHEMA_VERSION, this is a single PRAGMA read.
+
     Args:
         db_path: The path to the SQLite database file.
 
@@ -52,15 +146,50 @@ def initialize_database(db_path: Path):
         sqlite3.Error: If the table cannot be created.
     """
     try:
-        with get_db_connection(db_path) as conn:
+        conn = get_db_connection(db_path)
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            logger.info("Database schema '%s' is up to date.", TABLE_NAME)
+            return
+
+        _migrate_to_without_rowid(conn)
+        with conn:
             conn.execute(SCHEMA)
-            conn.commit()
-            logging.info(f"Database schema '{TABLE_NAME}' initialized successfully.")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            logger.info("Database schema '%s' initialized successfully.", TABLE_NAME)
     except sqlite3.Error as e:
-        logging.error(f"Database error during schema initialization: {e}")
+        logger.error("Database error during schema initialization: %s", e)
         raise
 
 
+@lru_cache(maxsize=None)
+def _insert_articles_sql(row_count: int) -> str:
+    """Returns the multi-row INSERT statement for a batch of ``row_count`` articles."""
+    values = ", ".join(["(?, ?, ?)"] * row_count)
+    return f"INSERT OR IGNORE INTO {TABLE_NAME} (link, title, criticality_score) VALUES {values}"
+
+
+def _insert_batches(rows: List[Tuple]) -> Iterator[List[Tuple]]:
+    """Splits rows into batches of INSERT_BATCH_SIZE, then power-of-two sizes for the remainder."""
+    start, size = 0, INSERT_BATCH_SIZE
+    while start < len(rows):
+        while size > len(rows) - start:
+            size //= 2
+        yield rows[start:start + size]
+        start += size
+
+
+def _to_archive_row(result: AnalysisResult) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+    """Converts an analysis result into a (link, title, criticality_score) row."""
+    score = (result.get('analysis') or {}).get('criticality_score')
+    # LLMs usually return an int already; only fall back to parsing otherwise.
+    if score is not None and not isinstance(score, int):
+        try:
+            score = int(score)
+        except (ValueError, TypeError):
+            score = None
+    return result.get('link'), result.get('title'), score
+
+
 def add_articles_to_archive(db_path: Path, analysis_results: List[AnalysisResult]):
     """
 
@@ -73,30 +202,18 @@ def add_articles_to_archive(db_path: Path, analysis_results: List[AnalysisResult
     if not analysis_results:
         return
 
-    articles_to_insert: List[Tuple] = []
-    for result in analysis_results:
-        analysis = result.get('analysis', {})
-        score = analysis.get('criticality_score')
-        try:
-            criticality_score = int(score) if score is not None else None
-        except (ValueError, TypeError):
-            criticality_score = None
-
-        articles_to_insert.append((
-            result.get('link'),
-            result.get('title'),
-            criticality_score
-        ))
+    articles_to_insert: List[Tuple] = list(map(_to_archive_row, analysis_results))
 
     try:
+        inserted_count = 0
         with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            query = f"INSERT OR IGNORE INTO {TABLE_NAME} (link, title, criticality_score) VALUES (?, ?, ?)"
-            cursor.executemany(query, articles_to_insert)
-            conn.commit()
-            logging.info(f"Archived {cursor.rowcount} new articles in the database.")
+            # One multi-row INSERT per batch instead of one statement step per row.
+            for batch in _insert_batches(articles_to_insert):
+                cursor = conn.execute(_insert_articles_sql(len(batch)), tuple(chain.from_iterable(batch)))
+                inserted_count += cursor.rowcount
+        logger.info("Archived %s new articles in the database.", inserted_count)
     except sqlite3.Error as e:
-        logging.error(f"Failed to add articles to archive: {e}")
+        logger.error("Failed to add articles to archive: %s", e)
 
 
 def filter_new_articles(db_path: Path, articles: List[AnalysisResult]) -> List[AnalysisResult]:
@@ -118,20 +235,22 @@ def filter_new_articles(db_path: Path, articles: List[AnalysisResult]) -> List[A
         return []
 
     try:
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            placeholders = ', '.join('?' for _ in links_to_check)
-            query = f"SELECT link FROM articles WHERE link IN ({placeholders})"
-
-            cursor.execute(query, tuple(links_to_check))
-            existing_links: Set[str] = {row[0] for row in cursor.fetchall()}
+        conn = get_db_connection(db_path)
+        conn.execute(CANDIDATE_LINKS_SCHEMA)
+        with conn:
+            # The candidates are staged in a temp table so the lookup is a fixed,
+            # reusable anti-join instead of a freshly built IN (?, ?, ...) list.
+            conn.execute(CLEAR_CANDIDATE_LINKS)
+            conn.executemany(INSERT_CANDIDATE_LINK, ((link,) for link in links_to_check))
+            cursor = conn.execute(NEW_LINKS_QUERY)
+            new_links: Set[str] = {row[0] for row in cursor.fetchall()}
     except sqlite3.Error as e:
-        logging.error(f"Could not query archive for existing articles: {e}. Assuming all are new.")
+        logger.error("Could not query archive for existing articles: %s. Assuming all are new.", e)
         return articles
 
     new_articles = [
-        article for article in articles if article['link'] not in existing_links
+        article for article in articles if article.get('link') in new_links
     ]
 
-    logging.info(f"Archive check: Found {len(new_articles)} new articles out of {len(articles)} relevant candidates.")
+    logger.info("Archive check: Found %s new articles out of %s relevant candidates.", len(new_articles), len(articles))
     return new_articles
@@ -6,11 +6,18 @@ Modules import ``AppConfig`` instead of passing raw dictionaries around.
 """
 
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated, List, Optional
 
 import yaml
-from pydantic import BaseModel, BeforeValidator, Field
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+
+try:
+    # The libyaml-backed loader is several times faster than the pure-Python one.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
 
 
 def _none_to_list(v: object) -> object:
@@ -25,6 +32,7 @@ StrList = Annotated[List[str], BeforeValidator(_none_to_list)]
 
 from .constants import (
     DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_EMBEDDING_BACKEND,
     DEFAULT_SCOUT_USER_AGENT,
     DEFAULT_SCOUT_TIMEOUT,
     DEFAULT_SPECULATOR_USER_AGENT,
@@ -35,30 +43,36 @@ from .constants import (
 )
 
 
+class _ConfigModel(BaseModel):
+    """Base for every config section: read-only once loaded, unknown keys ignored."""
+
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
 # ── project_info ──────────────────────────────────────────────────────
 
-class BuildConfig(BaseModel):
+class BuildConfig(_ConfigModel):
     minSdk: int = 24
     targetSdk: int = 34
     compileSdk: int = 34
     build_features: StrList = Field(default_factory=list)
 
 
-class Capabilities(BaseModel):
+class Capabilities(_ConfigModel):
     permissions: StrList = Field(default_factory=list)
     features: StrList = Field(default_factory=list)
 
 
-class VersionCatalogFile(BaseModel):
+class VersionCatalogFile(_ConfigModel):
     enabled: bool = False
 
 
-class DependencySources(BaseModel):
+class DependencySources(_ConfigModel):
     version_catalog_file: VersionCatalogFile = Field(default_factory=VersionCatalogFile)
     manual_keywords: StrList = Field(default_factory=list)
 
 
-class ProjectInfo(BaseModel):
+class ProjectInfo(_ConfigModel):
     context: str = ""
     build_config: BuildConfig = Field(default_factory=BuildConfig)
     capabilities: Capabilities = Field(default_factory=Capabilities)
@@ -67,42 +81,47 @@ class ProjectInfo(BaseModel):
 
 # ── data_sources ──────────────────────────────────────────────────────
 
-class DataSources(BaseModel):
+class DataSources(_ConfigModel):
     rss_feeds: StrList = Field(default_factory=list)
     github_releases: StrList = Field(default_factory=list)
 
 
 # ── analysis_rules ────────────────────────────────────────────────────
 
-class AnalysisRules(BaseModel):
+class AnalysisRules(_ConfigModel):
     lookback_period_hours: int = 24
     vigil_similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    vigil_disable: bool = False
 
 
 # ── ai_settings ───────────────────────────────────────────────────────
 
-class AgentConfig(BaseModel):
+class AgentConfig(_ConfigModel):
     provider: str = "ollama"
     temperature: float = 0.2
     model: str = "llama3.1"
 
 
-class GoogleProviderConfig(BaseModel):
+class GoogleProviderConfig(_ConfigModel):
     model: str = "gemini-2.5-flash"
     project_id: Optional[str] = None
 
 
-class OllamaProviderConfig(BaseModel):
+class OllamaProviderConfig(_ConfigModel):
     base_url: Optional[str] = None
 
 
-class Providers(BaseModel):
+class Providers(_ConfigModel):
     google: GoogleProviderConfig = Field(default_factory=GoogleProviderConfig)
     ollama: OllamaProviderConfig = Field(default_factory=OllamaProviderConfig)
 
 
-class AISettings(BaseModel):
+class AISettings(_ConfigModel):
     embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    embedding_backend: str = DEFAULT_EMBEDDING_BACKEND
+    embedding_device: Optional[str] = None
+    embedding_dtype: Optional[str] = None
+    embedding_batch_size: Optional[int] = None
     legatus_agent: AgentConfig = Field(default_factory=AgentConfig)
     inquisitor_agent: AgentConfig = Field(default_factory=lambda: AgentConfig(temperature=0.0))
     providers: Providers = Field(default_factory=Providers)
@@ -110,22 +129,22 @@ class AISettings(BaseModel):
 
 # ── module settings ───────────────────────────────────────────────────
 
-class ScoutSettings(BaseModel):
+class ScoutSettings(_ConfigModel):
     user_agent: str = DEFAULT_SCOUT_USER_AGENT
     timeout: int = DEFAULT_SCOUT_TIMEOUT
 
 
-class SpeculatorSettings(BaseModel):
+class SpeculatorSettings(_ConfigModel):
     user_agent: str = DEFAULT_SPECULATOR_USER_AGENT
     timeout: int = DEFAULT_SPECULATOR_TIMEOUT
     concurrency_limit: int = DEFAULT_CONCURRENCY_LIMIT
 
 
-class NotariusSettings(BaseModel):
+class NotariusSettings(_ConfigModel):
     format: str = DEFAULT_REPORT_FORMAT
 
 
-class SecuritySettings(BaseModel):
+class SecuritySettings(_ConfigModel):
     skip_ssl_verify: StrList = Field(default_factory=list)
 
 
@@ -135,7 +154,7 @@ class ConfigError(Exception):
     """Raised when the configuration file cannot be found or parsed."""
 
 
-class AppConfig(BaseModel):
+class AppConfig(_ConfigModel):
     """Top-level application configuration – mirrors ``config.yaml``."""
 
     debug: bool = False
@@ -170,11 +189,24 @@ class AppConfig(BaseModel):
             logging.error("=" * 80)
             raise ConfigError(error_msg)
 
-        try:
-            with open(config_path, "r") as f:
-                raw = yaml.safe_load(f) or {}
-        except yaml.YAMLError as e:
-            logging.error(f"Could not parse YAML configuration: {e}")
-            raise ConfigError(f"YAML parsing error in {config_path}: {e}") from e
+        # The model is immutable, so an unchanged file can share one parsed instance.
+        return _load_config_cached(cls, config_path, config_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(config_cls: type, config_path: Path, mtime_ns: int) -> AppConfig:
+    """
+    Parses and validates a configuration file.
+
+    Cached on the file's path and modification time, so an edited file is
+    picked up while an unchanged one is not re-read or re-validated.
+    """
+    try:
+        # Binary mode lets the loader decode the stream itself.
+        with open(config_path, "rb") as f:
+            raw = yaml.load(f, Loader=_YamlLoader) or {}
+    except yaml.YAMLError as e:
+        logging.error(f"Could not parse YAML configuration: {e}")
+        raise ConfigError(f"YAML parsing error in {config_path}: {e}") from e
 
-        return cls.model_validate(raw)
+    return config_cls.model_validate(raw)
@@ -3,6 +3,10 @@
 # ===================================================================
 # The key for the GitHub API token in the .env file.
 GITHUB_TOKEN_ENV_VAR = "GITHUB_TOKEN"
+# Optional override for the number of CPU threads used by the embedding model.
+TORCH_THREADS_ENV_VAR = "LEGATUS_TORCH_THREADS"
+# Optional override for the device the embedding model runs on (e.g. "cpu", "cuda").
+EMBEDDING_DEVICE_ENV_VAR = "LEGATUS_EMBEDDING_DEVICE"
 
 
 # ===================================================================
@@ -12,7 +16,10 @@ GITHUB_TOKEN_ENV_VAR = "GITHUB_TOKEN"
 
 # --- Vigil Settings ---
 DEFAULT_EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+DEFAULT_EMBEDDING_BACKEND = 'torch'
+DEFAULT_EMBEDDING_DEVICE = 'cpu'
 DEFAULT_SIMILARITY_THRESHOLD = 0.30
+DEFAULT_MAX_TORCH_THREADS = 8
 
 # --- Scout Settings ---
 DEFAULT_SCOUT_USER_AGENT = "LegatusScout/1.0"
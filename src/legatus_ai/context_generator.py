@@ -1,12 +1,19 @@
 import logging
+import zipfile
 from pathlib import Path
 from typing import Set, Dict, Any, Optional
 
-import toml
-from sentence_transformers import SentenceTransformer
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 
 from .config import AppConfig
-from .constants import DEFAULT_EMBEDDING_MODEL
+from .vigil import embedding_cache_key, embedding_variant, get_embedding_model
+
+logger = logging.getLogger(__name__)
 
 # A set of known Gradle plugin aliases that don't have a 'name' or 'module' property
 # and can be safely ignored to prevent spurious warnings.
@@ -25,48 +32,163 @@ def _parse_version_catalog(catalog_path: Path) -> Set[str]:
     """
     dependencies: Set[str] = set()
     try:
-        catalog = toml.load(catalog_path)
+        # tomllib only accepts binary file objects.
+        with open(catalog_path, 'rb') as f:
+            catalog = tomllib.load(f)
         versions = catalog.get('versions', {})
         libraries = catalog.get('libraries', {})
 
-        for lib_alias, lib_data in libraries.items():
-            name = None
-            version = None
+        # Local aliases keep the per-library loop to fast local lookups.
+        add_dependency = dependencies.add
+        ignored_aliases = IGNORED_CATALOG_ALIASES
 
-            if 'name' in lib_data:
+        for lib_alias, lib_data in libraries.items():
+            if isinstance(lib_data, str):
+                # Compact notation: alias = "group:name:version"
+                name, _, version = lib_data.partition(':')[2].partition(':')
+            else:
                 name = lib_data.get('name')
-            elif 'module' in lib_data:
-                # Format: module = "group:name"
-                module_str = lib_data.get('module', '')
-                if ':' in module_str:
-                    name = module_str.split(':')[1]
-
-            version_value = lib_data.get('version')
-            if isinstance(version_value, str):
-                version = version_value # Direct version: version = "1.2.3"
-            elif isinstance(version_value, dict):
-                # Referenced version: version.ref = "someVersion"
-                version_ref = version_value.get('ref')
-                if version_ref:
-                    version = versions.get(version_ref)
+                if name is None:
+                    # Format: module = "group:name"
+                    name = lib_data.get('module', '').partition(':')[2].partition(':')[0]
+
+                version = lib_data.get('version')
+                if isinstance(version, dict):
+                    # Referenced version: version.ref = "someVersion"
+                    version = versions.get(version.get('ref'))
+                elif not isinstance(version, str):
+                    version = None
 
             if name and version:
-                dependencies.add(f"{name}:{version}")
+                add_dependency(f"{name}:{version}")
             elif name:
-                dependencies.add(name)
-            else:
-                if lib_alias not in IGNORED_CATALOG_ALIASES:
-                    logging.warning(f"Could not determine name for alias '{lib_alias}' in '{catalog_path}'.")
-
+                add_dependency(name)
+            elif lib_alias not in ignored_aliases:
+                logger.warning("Could not determine name for alias '%s' in '%s'.", lib_alias, catalog_path)
 
     except FileNotFoundError:
-        logging.warning(f"Version catalog file not found at '{catalog_path}'. Skipping.")
-    except toml.TomlDecodeError as e:
-        logging.warning(f"Could not parse TOML file '{catalog_path}': {e}. Skipping.")
+        logger.warning("Version catalog file not found at '%s'. Skipping.", catalog_path)
+    except tomllib.TOMLDecodeError as e:
+        logger.warning("Could not parse TOML file '%s': %s. Skipping.", catalog_path, e)
     return dependencies
 
 
-def generate_full_context(config: AppConfig, catalog_path: Optional[Path]) -> Dict[str, Any]:
+def _load_embedding_cache(cache_path: Path) -> Dict[str, np.ndarray]:
+    """
+    Loads the persisted context segment embeddings, keyed by their cache key.
+
+    Returns:
+        The cached embeddings, or an empty dict if the file is missing or unreadable.
+    """
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            return {key: cached[key] for key in cached.files}
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile) as e:
+        logger.warning("Ignoring unreadable context embedding cache '%s': %s", cache_path, e)
+    return {}
+
+
+def _save_embedding_cache(cache_path: Path, embeddings: Dict[str, np.ndarray]):
+    """Persists the segment embeddings, replacing any previous cache file atomically."""
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **embeddings)
+        tmp_path.replace(cache_path)
+    except OSError as e:
+        logger.warning("Could not persist context embedding cache to '%s': %s", cache_path, e)
+
+
+def _embed_context_segments(
+        config: AppConfig,
+        segments: Dict[str, str],
+        cache_path: Optional[Path]
+) -> np.ndarray:
+    """
+    Embeds each context segment separately and combines them into one unit vector.
+
+    Segments are cached independently, so editing the narrative does not force the
+    dependency list to be re-encoded (and vice versa). Encoding shorter texts also
+    keeps each one within the model's input length instead of truncating the tail.
+
+    Args:
+        config: The validated application configuration, which selects the model.
+        segments: Segment name to the text to embed.
+        cache_path: Optional file in which the segment embeddings are persisted.
+            Quantized backends and lower-precision weights embed slightly
+            differently, so both are part of the cache key.
+
+    Returns:
+        The normalized sum of the normalized segment embeddings, as float32.
+    """
+    model_name = config.ai_settings.embedding_model
+    variant = embedding_variant(config.ai_settings)
+    # Hex, since the keys double as member names in the .npz file.
+    keys = {name: embedding_cache_key(model_name, variant, text).hex() for name, text in segments.items()}
+    cached = _load_embedding_cache(cache_path) if cache_path is not None else {}
+
+    missing = [name for name in segments if keys[name] not in cached]
+    reused = [name for name in segments if name not in missing]
+    if reused:
+        logger.info("Reusing cached embeddings for unchanged context segments: %s", ', '.join(reused))
+
+    if missing:
+        logger.info("Using embedding model: %s", model_name)
+        # Shares Vigil's cached model, so the weights are loaded once per process.
+        model = get_embedding_model(config)
+        encoded = model.encode([segments[name] for name in missing], normalize_embeddings=True)
+        for name, embedding in zip(missing, encoded):
+            cached[keys[name]] = embedding
+        if cache_path is not None:
+            _save_embedding_cache(cache_path, {keys[name]: cached[keys[name]] for name in segments})
+
+    # Stored as contiguous float32, the dtype of the article embeddings, so Vigil
+    # can score against it without converting it first.
+    combined = np.sum([cached[keys[name]] for name in segments], axis=0, dtype=np.float32)
+    norm = np.linalg.norm(combined)
+    return np.ascontiguousarray(combined / norm if norm else combined)
+
+
+def embed_project_context(
+        config: AppConfig,
+        full_context: Dict[str, Any],
+        embedding_cache_path: Optional[Path] = None
+) -> np.ndarray:
+    """
+    Generates the semantic embedding of a project context.
+
+    Args:
+        config: The validated application configuration.
+        full_context: The context built by ``generate_full_context``.
+        embedding_cache_path: Optional file in which the context embeddings are persisted.
+            Segments whose model and text are unchanged are loaded from it instead
+            of being re-encoded.
+
+    Returns:
+        The unit-length project embedding.
+    """
+    logger.info("Generating project context embedding...")
+    narrative = full_context['narrative']
+    segments = {"narrative": f"Project focus: {narrative}."}
+    if full_context['dependencies']:
+        # Sorted so identical configs always embed the same text; set order varies between runs.
+        # The label is joined together with the names so the segment is built in a single pass.
+        segments["dependencies"] = ' '.join(["Key technologies and libraries used:", *sorted(full_context['dependencies'])])
+
+    context_embedding = _embed_context_segments(config, segments, embedding_cache_path)
+    logger.debug("Generated project embedding with shape: %s", context_embedding.shape)
+    return context_embedding
+
+
+def generate_full_context(
+        config: AppConfig,
+        catalog_path: Optional[Path],
+        embedding_cache_path: Optional[Path] = None,
+        include_embedding: bool = True
+) -> Dict[str, Any]:
     """
     Generates the full, rich project context object from all configured sources.
 
@@ -76,13 +198,19 @@ def generate_full_context(config: AppConfig, catalog_path: Optional[Path]) -> Di
     Args:
         config: The validated application configuration.
         catalog_path: Optional path to the project's .toml version catalog file.
+        embedding_cache_path: Optional file in which the context embeddings are persisted.
+            Segments whose model and text are unchanged are loaded from it instead
+            of being re-encoded.
+        include_embedding: If False, the embedding is left out so that callers can
+            compute it with ``embed_project_context`` only once it is needed.
 
     Returns:
-        A dictionary representing the full project context, including the embedding.
+        A dictionary representing the full project context, including the embedding
+        unless it was excluded.
     """
-    logging.info("=" * 80)
-    logging.info("Context Generator: Building full project fingerprint...")
-    logging.info("=" * 80)
+    logger.info("=" * 80)
+    logger.info("Context Generator: Building full project fingerprint...")
+    logger.info("=" * 80)
 
     project_info = config.project_info
     full_context = {
@@ -94,24 +222,13 @@ def generate_full_context(config: AppConfig, catalog_path: Optional[Path]) -> Di
 
     vc_config = project_info.dependency_sources.version_catalog_file
     if vc_config.enabled and catalog_path is not None:
-        logging.info(f"Parsing dependencies from version catalog: {catalog_path}")
+        logger.info("Parsing dependencies from version catalog: %s", catalog_path)
         full_context["dependencies"].update(_parse_version_catalog(catalog_path))
     else:
-        logging.info("Version catalog parsing is disabled or no path is configured.")
-
-    # Generate the semantic embedding for the project context
-    logging.info("Generating project context embedding...")
-    narrative = full_context.get('narrative', '')
-    dependencies_str = ' '.join(full_context.get('dependencies', set()))
-    full_text_context = f"Project focus: {narrative}. Key technologies and libraries used: {dependencies_str}"
-
-    model_name = config.ai_settings.embedding_model
-    logging.info(f"Using embedding model: {model_name}")
+        logger.info("Version catalog parsing is disabled or no path is configured.")
 
-    model = SentenceTransformer(model_name)
-    context_embedding = model.encode(full_text_context)
-    full_context['embedding'] = context_embedding
-    logging.debug(f"Generated project embedding with shape: {context_embedding.shape}")
+    if include_embedding:
+        full_context['embedding'] = embed_project_context(config, full_context, embedding_cache_path)
 
-    logging.info("Context generation complete.")
+    logger.info("Context generation complete.")
     return full_context
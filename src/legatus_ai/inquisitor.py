@@ -1,7 +1,8 @@
 import asyncio
 import logging
-from collections import deque
-from typing import List, Dict, Any, Deque
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any
 
 from dotenv import load_dotenv
 from langchain_classic.agents import create_react_agent, AgentExecutor
@@ -15,7 +16,10 @@ from rich.console import Console
 from .config import AppConfig, ConfigError
 from .paths import resolve_paths, ApplicationPaths
 from .utils import get_project_root
-from .tools import create_sql_query_tool, create_web_fetcher_tool
+from .tools import create_sql_query_tool, create_web_fetcher_tool, close_shared_session
+
+# Number of messages (user + assistant) kept as conversational memory.
+MAX_CHAT_HISTORY_MESSAGES = 20
 
 
 def initialize_llm(config: AppConfig) -> BaseLanguageModel:
@@ -35,6 +39,20 @@ def initialize_llm(config: AppConfig) -> BaseLanguageModel:
     )
 
 
+@lru_cache(maxsize=4)
+def _load_prompt_template(prompt_path: Path, mtime_ns: int, rendered_tools: str, tool_names: str) -> ChatPromptTemplate:
+    """
+    Reads and compiles the Inquisitor prompt with the tool descriptions filled in.
+
+    Cached on the file's path and modification time, so an edited prompt is
+    picked up while an unchanged one is not re-read or re-parsed.
+    """
+    logging.info(f"Loading Inquisitor prompt from '{prompt_path}'.")
+    prompt_template_str = prompt_path.read_bytes().decode('utf-8')
+    prompt = ChatPromptTemplate.from_template(prompt_template_str)
+    return prompt.partial(tools=rendered_tools, tool_names=tool_names)
+
+
 def assemble_agent(llm: BaseLanguageModel, config: AppConfig, paths: ApplicationPaths) -> AgentExecutor:
     """
     Assembles the tools, prompt, and agent executor.
@@ -56,14 +74,12 @@ def assemble_agent(llm: BaseLanguageModel, config: AppConfig, paths: Application
     tool_names = ", ".join([t.name for t in tools])
 
     try:
-        prompt_template_str = paths.inquisitor_prompt.read_text(encoding='utf-8')
+        prompt_path = paths.inquisitor_prompt.resolve()
+        prompt = _load_prompt_template(prompt_path, prompt_path.stat().st_mtime_ns, rendered_tools, tool_names)
     except FileNotFoundError:
         logging.critical(f"FATAL: Inquisitor prompt not found at '{paths.inquisitor_prompt}'. Cannot start agent.")
         raise
 
-    prompt = ChatPromptTemplate.from_template(prompt_template_str)
-    prompt = prompt.partial(tools=rendered_tools, tool_names=tool_names)
-
     def handle_parsing_errors(error: Exception) -> str:
         """A custom error handler to guide the agent on parsing failures."""
         response = str(error)
@@ -93,7 +109,7 @@ async def interactive_loop(agent_executor: AgentExecutor, console: Console):
 
     # Get the current running event loop
     loop = asyncio.get_running_loop()
-    chat_history: Deque[BaseMessage] = deque(maxlen=20)
+    chat_history: List[BaseMessage] = []
 
     while True:
         try:
@@ -106,12 +122,16 @@ async def interactive_loop(agent_executor: AgentExecutor, console: Console):
                 continue
 
             with console.status("[bold yellow]Inquisitor is thinking...[/bold yellow]", spinner="dots"):
+                # The history is only mutated after the call returns, so no copy is needed.
                 response = await agent_executor.ainvoke({
                     "input": user_query,
-                    "chat_history": list(chat_history)  # Pass a copy
+                    "chat_history": chat_history
                 })
 
             console.print(f"\n[bold blue]Inquisitor:[/bold blue] {response['output']}")
+            if len(chat_history) >= MAX_CHAT_HISTORY_MESSAGES:
+                # Drop the oldest question/answer pair.
+                del chat_history[:2]
             chat_history.append(HumanMessage(content=user_query))
             chat_history.append(AIMessage(content=response['output']))
 
@@ -123,6 +143,14 @@ async def interactive_loop(agent_executor: AgentExecutor, console: Console):
             console.print(f"[bold red]An unexpected error occurred: {e}[/bold red]")
 
 
+async def _run_interactive_session(agent_executor: AgentExecutor, console: Console):
+    """Runs the interactive loop, then closes the web fetcher's pooled connections."""
+    try:
+        await interactive_loop(agent_executor, console)
+    finally:
+        await close_shared_session()
+
+
 def inquisitor_main():
     """The main entrypoint for the interactive Inquisitor agent."""
     load_dotenv()
@@ -144,7 +172,7 @@ def inquisitor_main():
         llm = initialize_llm(config)
         agent_executor = assemble_agent(llm, config, paths)
 
-        asyncio.run(interactive_loop(agent_executor, console))
+        asyncio.run(_run_interactive_session(agent_executor, console))
 
     except (ConfigError, ValueError, FileNotFoundError) as e:
         logging.critical(f"A critical error occurred during setup: {e}")
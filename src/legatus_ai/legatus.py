@@ -1,27 +1,41 @@
 import os
 import json
 import logging
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 
 from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
 from langchain_core.runnables import Runnable
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.messages import SystemMessage
-from langchain_google_vertexai import ChatVertexAI
-from langchain_ollama import ChatOllama
 
-from .archivum import initialize_database, filter_new_articles, add_articles_to_archive
+from .archivum import initialize_database, filter_new_articles, add_articles_to_archive, close_db_connections
 from .config import AppConfig
-from .context_generator import generate_full_context
-from .notarius import generate_report
+from .context_generator import embed_project_context, generate_full_context
+from .notarius import generate_report, sort_by_criticality
 from .speculator import run_speculator
 from .constants import GITHUB_TOKEN_ENV_VAR
 from .paths import resolve_paths
 from .utils import get_project_root
-from .vigil import filter_articles
-from .scout import run_scout
+from .vigil import (
+    close_embedding_cache, configure_torch_threads, filter_articles, is_filtering_disabled, preload_embedding_model
+)
+from .scout import run_scout, load_feed_cache, save_feed_cache, restore_feed_validators
+
+
+@lru_cache(maxsize=8)
+def _read_prompt_template(prompt_path: Path, mtime_ns: int) -> str:
+    """
+    Reads a prompt template file.
+
+    Cached on the file's path and modification time, so an edited prompt is
+    picked up while an unchanged one is not read again.
+    """
+    return prompt_path.read_bytes().decode('utf-8')
 
 
 def initialize_ai_chain(config: AppConfig, context_string: str, prompt_path: Path) -> Optional[Runnable]:
@@ -48,35 +62,50 @@ def initialize_ai_chain(config: AppConfig, context_string: str, prompt_path: Pat
         f"{context_string}"
     )
 
-    llm: Optional[ChatOllama | ChatVertexAI] = None
+    # Provider SDKs are imported on demand; each pulls in a large dependency tree
+    # (Google auth/gRPC, httpx) that a run using the other provider never needs.
+    llm: Optional[BaseChatModel] = None
     if provider == "google":
         google_cfg = config.ai_settings.providers.google
         if not google_cfg.project_id:
-            logging.warning(f"Google provider selected but 'project_id' is not configured.")
+            logging.warning("Google provider selected but 'project_id' is not configured.")
             return None
+        from langchain_google_vertexai import ChatVertexAI
+
         llm = ChatVertexAI(
             project_id=google_cfg.project_id,
             model_name=google_cfg.model,
             temperature=legatus_cfg.temperature,
-            convert_system_message_to_human=True
+            convert_system_message_to_human=True,
+            # JSON mode, like format="json" for Ollama: the reply is the bare object.
+            response_mime_type="application/json",
         )
     elif provider == "ollama":
+        import httpx
+        from langchain_ollama import ChatOllama
+
         ollama_cfg = config.ai_settings.providers.ollama
+        # The chain's single async client serves all concurrent Speculator workers;
+        # keep one connection alive per worker so none is re-opened between articles.
+        concurrency = config.speculator_settings.concurrency_limit
         llm = ChatOllama(
             model=legatus_cfg.model,
             base_url=ollama_cfg.base_url,
             temperature=legatus_cfg.temperature,
             format="json",
+            async_client_kwargs={
+                "limits": httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+            },
         )
 
     if not llm:
-        logging.warning(f"AI provider '{provider}' is not configured correctly or is unsupported.")
+        logging.warning("AI provider '%s' is not configured correctly or is unsupported.", provider)
         return None
 
     try:
-        user_prompt_template = prompt_path.read_text(encoding='utf-8')
+        user_prompt_template = _read_prompt_template(prompt_path, prompt_path.stat().st_mtime_ns)
     except FileNotFoundError:
-        logging.error(f"Critical prompt file not found at '{prompt_path}'.")
+        logging.error("Critical prompt file not found at '%s'.", prompt_path)
         return None
 
     prompt = ChatPromptTemplate.from_messages([
@@ -89,27 +118,22 @@ def initialize_ai_chain(config: AppConfig, context_string: str, prompt_path: Pat
 
 def _log_summary(project_context: Dict, found_articles: List, relevant_articles: List, new_articles: List,
                  final_analyses: List):
-    """Logs the final execution summary."""
+    """Logs the final execution summary; ``final_analyses`` is expected sorted by criticality."""
     logging.info("=" * 80)
     logging.info("  Execution Summary")
     logging.info("=" * 80)
-    logging.info(f"Project Dependencies Identified: {len(project_context.get('dependencies', []))}")
-    logging.info(f"Potential Articles Found: {len(found_articles)}")
-    logging.info(f"Relevant Articles (Vigilum Filter): {len(relevant_articles)}")
-    logging.info(f"New Articles (Archive Check): {len(new_articles)}")
-    logging.info(f"Final Analyses (Speculator): {len(final_analyses)}")
+    logging.info("Project Dependencies Identified: %s", len(project_context.get('dependencies', [])))
+    logging.info("Potential Articles Found: %s", len(found_articles))
+    logging.info("Relevant Articles (Vigilum Filter): %s", len(relevant_articles))
+    logging.info("New Articles (Archive Check): %s", len(new_articles))
+    logging.info("Final Analyses (Speculator): %s", len(final_analyses))
 
     if not final_analyses:
         logging.info("No new, relevant articles were found to analyze.")
         return
 
     logging.info("--- DETAILED ANALYSIS ---")
-    sorted_analyses = sorted(
-        final_analyses,
-        key=lambda x: x.get('analysis', {}).get('criticality_score', 0),
-        reverse=True
-    )
-    for report in sorted_analyses:
+    for report in final_analyses:
         analysis = report.get('analysis', {})
         title = report.get('title', 'N/A')
         link = report.get('link', '#')
@@ -117,10 +141,10 @@ def _log_summary(project_context: Dict, found_articles: List, relevant_articles:
         justification = analysis.get('justification', 'No justification provided.')
         summary = analysis.get('summary', 'No summary provided.')
 
-        logging.info(f"\nTitle: {title}")
-        logging.info(f"Link: {link}")
-        logging.info(f"Criticality: {score}/5 - {justification}")
-        logging.info(f"Summary: {summary}")
+        logging.info("\nTitle: %s", title)
+        logging.info("Link: %s", link)
+        logging.info("Criticality: %s/5 - %s", score, justification)
+        logging.info("Summary: %s", summary)
         logging.info("-" * 25)
 
 
@@ -139,7 +163,7 @@ def legatus_main():
         config = AppConfig.from_yaml(paths.config)
         initialize_database(paths.database)
     except Exception as e:
-        logging.critical(f"Could not initialize the database. Exiting. Error: {e}")
+        logging.critical("Could not initialize the database. Exiting. Error: %s", e)
         raise SystemExit(1) from e
 
     logging.info("Legatus: Starting AI Deps Analyst...")
@@ -147,39 +171,71 @@ def legatus_main():
         logging.getLogger().setLevel(logging.DEBUG)
         logging.debug(">>> DEBUG MODE ENABLED <<<")
 
+    # Encoding runs on this thread, so PyTorch's thread count is set here rather
+    # than on the preload thread below.
+    configure_torch_threads()
+
     # --- Stage 1: Context Generation ---
-    project_context = generate_full_context(config, paths.version_catalog)
-    context_for_llm = project_context.copy()
-    context_for_llm.pop('embedding', None)
-    context_for_prompt = json.dumps(context_for_llm, indent=2, default=list)
-    logging.debug(f"Full Project Context:\n{context_for_prompt}")
+    # The embedding is only needed by Vigil, so it is left until articles are found.
+    project_context = generate_full_context(config, paths.version_catalog, include_embedding=False)
+    # Compact JSON keeps the system prompt free of indentation tokens; sets are
+    # sorted so the prompt is identical between runs with the same context.
+    context_for_prompt = json.dumps(project_context, separators=(',', ':'), default=sorted)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Full Project Context:\n%s", json.dumps(project_context, indent=2, default=sorted))
 
     # --- Stage 2: Initialize Shared AI Chain ---
     ai_chain = initialize_ai_chain(config, context_for_prompt, paths.legatus_prompt)
 
     # --- Stage 3: Scout - Gather raw data ---
     github_token = os.getenv(GITHUB_TOKEN_ENV_VAR)
-    found_articles = run_scout(config, github_token)
+    feed_cache = load_feed_cache(paths.feed_cache)
+    previous_feed_cache = dict(feed_cache)
+    found_articles = run_scout(config, github_token, feed_cache)
 
     # --- Stage 4: Vigilum - Filter by relevance ---
-    relevant_articles = filter_articles(found_articles, project_context, config)
+    # A disabled Vigil passes articles through unscored, so no embedding is needed.
+    if found_articles and not is_filtering_disabled(config):
+        # Only started once there is something to score, so a run without articles
+        # never loads the model. The load overlaps the embedding cache reads below;
+        # the model cache is locked, so the first encode simply waits for it.
+        threading.Thread(target=preload_embedding_model, args=(config,), name="embedding-preload").start()
+        project_context['embedding'] = embed_project_context(config, project_context, paths.context_embedding_cache)
+    relevant_articles = filter_articles(found_articles, project_context, config, paths.article_embedding_cache)
 
     # --- Stage 5: Archivum - Filter out already-reported articles
     new_relevant_articles = filter_new_articles(paths.database, relevant_articles)
 
     # --- Stage 6: Speculator - Perform deep analysis ---
     final_analyses = []
+    failed_links: Set[str] = set()
     if new_relevant_articles and ai_chain:
-        final_analyses = run_speculator(new_relevant_articles, ai_chain, config)
+        final_analyses = run_speculator(new_relevant_articles, ai_chain, config, failed_links)
     elif not ai_chain:
         logging.warning("AI chain not initialized, skipping LLM analysis.")
 
     if final_analyses:
+        # Sorted once, so the report and the summary both list the most critical first.
+        sort_by_criticality(final_analyses)
         # --- Stage 7: Notarius - Generate and save the report
         generate_report(config, paths.report_dir, final_analyses)
         # --- Stage 8: Archivum - Save new analyses to memory
         add_articles_to_archive(paths.database, final_analyses)
 
+    # Unchanged feeds are skipped on the next run, so a feed only keeps its new
+    # validators if none of its articles failed the analysis. Articles the LLM
+    # judged irrelevant count as analyzed and are not retried.
+    if ai_chain:
+        failed_feeds = {
+            article['feed'] for article in new_relevant_articles
+            if article.get('link') in failed_links and article.get('feed')
+        }
+        restore_feed_validators(feed_cache, previous_feed_cache, failed_feeds)
+        save_feed_cache(paths.feed_cache, feed_cache)
+
+    close_db_connections()
+    close_embedding_cache()
+
     _log_summary(project_context, found_articles, relevant_articles, new_relevant_articles, final_analyses)
 
 
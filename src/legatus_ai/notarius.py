@@ -3,14 +3,35 @@ import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Set, Tuple
 
 from .config import AppConfig
 
+try:
+    # orjson encodes straight to UTF-8 bytes and is much faster for indented output.
+    import orjson
+except ImportError:  # optional; the standard library encoder is used instead
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 # A simple type alias for clarity
 AnalysisResult = Dict[str, Any]
 
 
+def _csv_row(report: AnalysisResult, reported_at: str) -> Tuple[Any, ...]:
+    """Flattens one analysis result into a CSV row, in header order."""
+    analysis = report.get('analysis', {})
+    return (
+        report.get('title', 'N/A'),
+        report.get('link', '#'),
+        analysis.get('criticality_score', 'N/A'),
+        analysis.get('justification', 'No justification provided.'),
+        analysis.get('summary', 'No summary provided.'),
+        reported_at,
+    )
+
+
 def _write_csv_report(output_path: Path, analysis_results: List[AnalysisResult]):
     """Writes the analysis results to a CSV file."""
     headers = [
@@ -21,24 +42,16 @@ def _write_csv_report(output_path: Path, analysis_results: List[AnalysisResult])
         "Summary",
         "Reported_At_UTC"
     ]
+    # One timestamp for the whole report, matching the JSON writer.
+    reported_at = datetime.now(timezone.utc).isoformat()
     try:
         with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=headers)
-            writer.writeheader()
-
-            for report in analysis_results:
-                analysis = report.get('analysis', {})
-                writer.writerow({
-                    "Title": report.get('title', 'N/A'),
-                    "Link": report.get('link', '#'),
-                    "Criticality": analysis.get('criticality_score', 'N/A'),
-                    "Justification": analysis.get('justification', 'No justification provided.'),
-                    "Summary": analysis.get('summary', 'No summary provided.'),
-                    "Reported_At_UTC": datetime.now(timezone.utc).isoformat()
-                })
-        logging.info(f"Successfully generated CSV report at: {output_path}")
+            writer = csv.writer(csvfile)
+            writer.writerow(headers)
+            writer.writerows(_csv_row(report, reported_at) for report in analysis_results)
+        logger.info("Successfully generated CSV report at: %s", output_path)
     except IOError as e:
-        logging.error(f"Failed to write CSV report to {output_path}. Reason: {e}")
+        logger.error("Failed to write CSV report to %s. Reason: %s", output_path, e)
 
 
 def _write_json_report(output_path: Path, analysis_results: List[AnalysisResult]):
@@ -50,12 +63,19 @@ def _write_json_report(output_path: Path, analysis_results: List[AnalysisResult]
         "analyses": analysis_results
     }
     try:
-        with open(output_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(report_data, jsonfile, indent=2)
-        logging.info(f"Successfully generated JSON report at: {output_path}")
+        if orjson is not None:
+            with open(output_path, 'wb') as jsonfile:
+                jsonfile.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as jsonfile:
+                json.dump(report_data, jsonfile, indent=2)
+        logger.info("Successfully generated JSON report at: %s", output_path)
     except IOError as e:
-        logging.error(f"Failed to write JSON report to {output_path}. Reason: {e}")
+        logger.error("Failed to write JSON report to %s. Reason: %s", output_path, e)
+
 
+# Report directories already created by this process.
+_created_report_dirs: Set[Path] = set()
 
 _REPORT_WRITERS: Dict[str, Callable[[Path, List[AnalysisResult]], None]] = {
     "csv": _write_csv_report,
@@ -63,46 +83,55 @@ _REPORT_WRITERS: Dict[str, Callable[[Path, List[AnalysisResult]], None]] = {
 }
 
 
+def _criticality_key(result: AnalysisResult) -> Any:
+    """Sort key for an analysis result: its criticality score, 0 when unscored."""
+    return result.get('analysis', {}).get('criticality_score', 0)
+
+
+def sort_by_criticality(analysis_results: List[AnalysisResult]) -> None:
+    """Sorts analysis results in place by criticality score, highest first."""
+    # list.sort computes each key once up front, so the lookups cost one call per
+    # result rather than one per comparison.
+    analysis_results.sort(key=_criticality_key, reverse=True)
+
+
 def generate_report(config: AppConfig, output_path: Path, analysis_results: List[AnalysisResult]):
     """
     Generates a user-facing report from the analysis results.
 
-    Sorts the results by criticality and uses the format and path specified
+    Writes the results in the order given, using the format and path specified
     in the configuration.
 
     Args:
         config: The validated application configuration.
         output_path: The output path for reports.
-        analysis_results: A list of analysis dictionaries from the Speculator.
+        analysis_results: A list of analysis dictionaries from the Speculator,
+            already ordered by ``sort_by_criticality``.
     """
     if not analysis_results:
-        logging.info("No analysis results to report. Skipping report generation.")
+        logger.info("No analysis results to report. Skipping report generation.")
         return
 
     report_format = config.notarius_settings.format.lower()
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    final_report_path = (output_path / f"legatus_report_{timestamp}.{report_format}").resolve()
+    # UTC, like the timestamps inside the report; output_path is already absolute.
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    final_report_path = output_path / f"legatus_report_{timestamp}.{report_format}"
 
-    # Ensure the parent directory for the report exists
-    try:
-        final_report_path.parent.mkdir(parents=True, exist_ok=True)
-    except OSError as e:
-        logging.error(f"Could not create directory for report at '{output_path.parent}'. Error: {e}")
-        return
-
-    # Sort results by criticality, highest first, for a more readable report
-    sorted_results = sorted(
-        analysis_results,
-        key=lambda x: x.get('analysis', {}).get('criticality_score', 0),
-        reverse=True
-    )
+    # Ensure the report directory exists; it only needs creating once per process.
+    if output_path not in _created_report_dirs:
+        try:
+            output_path.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error("Could not create directory for report at '%s'. Error: %s", output_path, e)
+            return
+        _created_report_dirs.add(output_path)
 
-    logging.info(f"Generating '{report_format}' report for {len(sorted_results)} articles...")
+    logger.info("Generating '%s' report for %s articles...", report_format, len(analysis_results))
 
     if writer_func := _REPORT_WRITERS.get(report_format):
-        writer_func(final_report_path, sorted_results)
+        writer_func(final_report_path, analysis_results)
     else:
-        logging.error(
-            f"Unknown report format '{report_format}' specified in config. "
-            f"Available formats are: {list(_REPORT_WRITERS.keys())}"
+        logger.error(
+            "Unknown report format '%s' specified in config. Available formats are: %s",
+            report_format, list(_REPORT_WRITERS)
         )
@@ -1,7 +1,8 @@
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 @dataclass
 class ApplicationPaths:
@@ -11,6 +12,36 @@ class ApplicationPaths:
     inquisitor_prompt: Path
     report_dir: Path
     version_catalog: Optional[Path]
+    context_embedding_cache: Optional[Path] = None
+    feed_cache: Optional[Path] = None
+    article_embedding_cache: Optional[Path] = None
+
+
+def _scan_dir(directory: Path) -> Dict[str, os.DirEntry]:
+    """
+    Lists a directory once, keyed by entry name.
+
+    The entries carry their file type from the directory read itself, so the
+    existence checks below do not need a stat() call per path. A missing or
+    unreadable directory yields an empty mapping.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return {}
+
+
+def _is_file(entries: Dict[str, os.DirEntry], name: str) -> bool:
+    """Whether ``name`` was listed as a regular file (symlinks are followed)."""
+    entry = entries.get(name)
+    return entry is not None and entry.is_file()
+
+
+def _is_dir(entries: Dict[str, os.DirEntry], name: str) -> bool:
+    """Whether ``name`` was listed as a directory (symlinks are followed)."""
+    entry = entries.get(name)
+    return entry is not None and entry.is_dir()
 
 
 def resolve_paths(project_root: Path) -> ApplicationPaths:
@@ -35,42 +66,49 @@ def resolve_paths(project_root: Path) -> ApplicationPaths:
     user_version_catalog = project_root / "project_data" / "libs.versions.toml"
 
     logging.info("Resolving application paths based on user mounts...")
-    if user_config_path.is_file():
+    root_entries = _scan_dir(project_root)
+    # The nested directories are only listed when they exist.
+    prompt_entries = _scan_dir(user_prompts_dir) if _is_dir(root_entries, "prompts") else {}
+    project_data_entries = (
+        _scan_dir(user_version_catalog.parent) if _is_dir(root_entries, "project_data") else {}
+    )
+
+    if _is_file(root_entries, "config.yaml"):
         logging.info(f"Found user-provided config at '{user_config_path}'.")
         config_path = user_config_path
     else:
         logging.info(f"User config not found. Using default config path in the root.")
         config_path = Path("config.yaml")
 
-    if user_data_dir.is_dir():
+    if _is_dir(root_entries, "data"):
         db_path = user_data_dir / "legatus_archive.db"
         logging.info(f"Found user-provided data dir at '{user_data_dir}'.")
     else:
         db_path = project_root / "data" / "legatus_archive.db"
         logging.info(f"User-provided data dir was not found, using default path for db '{db_path}'.")
 
-    if Path(user_legatus_prompt).is_file():
+    if _is_file(prompt_entries, user_legatus_prompt.name):
         logging.info("Found user-provided prompts for Legatus.")
         legatus_prompt_path = user_legatus_prompt
     else:
         logging.info("Using default prompt for Legatus.")
         legatus_prompt_path = project_root / "src" / "legatus_ai" /"defaults" / "prompts" / "prompt_legatus.txt"
 
-    if user_inquisitor_prompt.is_file():
+    if _is_file(prompt_entries, user_inquisitor_prompt.name):
         logging.info("Found user-provided prompts for Inquisitor.")
         inquisitor_prompt_path = user_inquisitor_prompt
     else:
         logging.info("Using default prompt for Inquisitor.")
         inquisitor_prompt_path = project_root / "src" / "legatus_ai" /"defaults" / "prompts" / "prompt_inquisitor.txt"
 
-    if user_reports_dir.is_dir():
+    if _is_dir(root_entries, "reports"):
         logging.info(f"Found user-provided directory for reports at '{user_reports_dir}'.")
         reports_path = user_reports_dir
     else:
         reports_path = project_root / "reports"
         logging.info(f"Using default location for reports at '{reports_path}'.")
 
-    if user_version_catalog.is_file():
+    if _is_file(project_data_entries, user_version_catalog.name):
         logging.info(f"Found .toml file for version catalog at '{user_version_catalog}'.")
         version_catalog_path = user_version_catalog
     else:
@@ -83,7 +121,10 @@ def resolve_paths(project_root: Path) -> ApplicationPaths:
         legatus_prompt=legatus_prompt_path,
         inquisitor_prompt=inquisitor_prompt_path,
         report_dir=reports_path,
-        version_catalog=version_catalog_path
+        version_catalog=version_catalog_path,
+        context_embedding_cache=db_path.parent / "context_embedding.npz",
+        feed_cache=db_path.parent / "feed_cache.json",
+        article_embedding_cache=db_path.parent / "article_embeddings.db"
     )
 
     return paths
@@ -1,20 +1,63 @@
 import asyncio
+import calendar
+import io
+import json
 import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Callable, Coroutine, Optional
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Dict, Any, Callable, Coroutine, Iterable, Optional
 from urllib.parse import urljoin
 
 import aiohttp
-import feedparser
+import lxml.html
 from aiohttp import ClientSession
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from .config import AppConfig
 from .constants import DEFAULT_SCOUT_TIMEOUT
-from .utils import should_verify_ssl_for_url
+from .utils import create_tcp_connector, should_verify_ssl_for_url
+
+try:
+    # orjson decodes bytes directly and is several times faster on large release payloads.
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional; the standard library decoder is used instead
+    _json_loads = json.loads
 
 # A simple type alias for clarity
 Article = Dict[str, Any]
+# Per-feed HTTP validators from the last successful fetch: {source_url: {"etag": ..., "last_modified": ...}}
+FeedCache = Dict[str, Dict[str, str]]
+
+# Summaries keep at most SUMMARY_MAX_CHARS of text, so only the start of a long
+# content block needs parsing. The HTML limit leaves ample room for markup.
+SUMMARY_MAX_CHARS = 400
+SUMMARY_HTML_LIMIT = 16_000
+
+# Entry links starting with these are already absolute and skip urljoin.
+_ABSOLUTE_URL_PREFIXES = ('http://', 'https://')
+
+
+def _html_to_text(html_content: str) -> str:
+    """
+    Returns the visible text of an HTML fragment.
+
+    Uses lxml's C parser directly instead of building a BeautifulSoup tree.
+    Like ``get_text(separator=' ', strip=True)``, text nodes are stripped and
+    joined by single spaces, and comments, scripts and styles are dropped.
+    """
+    try:
+        root = lxml.html.fragment_fromstring(html_content, create_parent='div')
+    except (etree.ParserError, ValueError):
+        # Fallback only, so bs4 is not imported unless lxml rejects a fragment.
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html_content, 'html.parser').get_text(separator=' ', strip=True)
+    etree.strip_elements(root, etree.Comment, 'script', 'style', with_tail=False)
+    return ' '.join(text for text in (node.strip() for node in root.itertext()) if text)
+
 
 def _extract_summary(entry) -> str:
     """
@@ -26,11 +69,12 @@ def _extract_summary(entry) -> str:
     if hasattr(entry, 'content') and entry.content:
         try:
             html_content = entry.content[0].value
-            soup = BeautifulSoup(html_content, 'html.parser')
-            text_content = soup.get_text(separator=' ', strip=True)
+            text_content = _html_to_text(html_content[:SUMMARY_HTML_LIMIT])
             if text_content:
                 # Truncate to reasonable length
-                return (text_content[:400] + '...') if len(text_content) > 400 else text_content
+                if len(text_content) > SUMMARY_MAX_CHARS:
+                    return text_content[:SUMMARY_MAX_CHARS] + '...'
+                return text_content
         except (IndexError, KeyError, TypeError, AttributeError):
             pass # Fall through
 
@@ -42,8 +86,198 @@ def _extract_summary(entry) -> str:
 
     return ""
 
-async def fetch_from_rss_async(client: ClientSession, config: AppConfig, source_url: str) -> List[Article]:
-    """Asynchronously fetches and filters recent articles from a single RSS feed."""
+# --- Feed Parsing ---
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+_RSS_ITEM = "item"
+_ATOM_ENTRY = f"{_ATOM}entry"
+
+
+def _element_text(elem: Optional[etree._Element]) -> Optional[str]:
+    """Returns an element's text, including any inline markup (e.g. Atom xhtml content)."""
+    if elem is None:
+        return None
+    if len(elem):
+        inner = (elem.text or "") + "".join(etree.tostring(child, encoding="unicode") for child in elem)
+    else:
+        inner = elem.text or ""
+    return inner.strip() or None
+
+
+def _parse_feed_date(value: Optional[str], rfc822: bool) -> Optional[time.struct_time]:
+    """Parses an RSS (RFC 822) or Atom (ISO 8601) date into a UTC struct_time, like feedparser."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value) if rfc822 else datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).timetuple()
+
+
+def _rss_entry(item: etree._Element) -> SimpleNamespace:
+    """Builds a feedparser-style entry from an RSS 2.0 <item>."""
+    link = item.findtext("link")
+    if not link:
+        guid = item.find("guid")
+        if guid is not None and guid.get("isPermaLink", "true") == "true":
+            link = guid.text
+    entry = SimpleNamespace(
+        title=(item.findtext("title") or "").strip(),
+        link=(link or "").strip(),
+        published_parsed=(_parse_feed_date(item.findtext("pubDate"), rfc822=True)
+                          or _parse_feed_date(item.findtext(_DC_DATE), rfc822=False)),
+        tags=[SimpleNamespace(term=c.text.strip()) for c in item.iterfind("category") if c.text],
+        summary=_element_text(item.find("description")),
+    )
+    if content := _element_text(item.find(_CONTENT_ENCODED)):
+        entry.content = [SimpleNamespace(value=content)]
+    return entry
+
+
+def _atom_entry(item: etree._Element) -> SimpleNamespace:
+    """Builds a feedparser-style entry from an Atom <entry>."""
+    link = next((l.get("href") for l in item.iterfind(f"{_ATOM}link")
+                 if l.get("rel", "alternate") == "alternate" and l.get("href")), "")
+    entry = SimpleNamespace(
+        title=_element_text(item.find(f"{_ATOM}title")) or "",
+        link=link.strip(),
+        published_parsed=(_parse_feed_date(item.findtext(f"{_ATOM}published"), rfc822=False)
+                          or _parse_feed_date(item.findtext(f"{_ATOM}updated"), rfc822=False)),
+        tags=[SimpleNamespace(term=c.get("term")) for c in item.iterfind(f"{_ATOM}category") if c.get("term")],
+        summary=_element_text(item.find(f"{_ATOM}summary")),
+    )
+    if content := _element_text(item.find(f"{_ATOM}content")):
+        entry.content = [SimpleNamespace(value=content)]
+    return entry
+
+
+_ENTRY_BUILDERS: Dict[str, Callable[[etree._Element], SimpleNamespace]] = {
+    _RSS_ITEM: _rss_entry,
+    _ATOM_ENTRY: _atom_entry,
+}
+
+
+def _parse_feed_lxml(feed_bytes: bytes) -> Optional[List[SimpleNamespace]]:
+    """
+    Parses an RSS 2.0 or Atom document with lxml, extracting only the fields Scout uses.
+
+    Entries are cleared as soon as they are read, so memory stays flat on large feeds.
+    Entities are not resolved and nothing is fetched from the network.
+
+    Returns:
+        The feed entries, or None if the document is not well-formed RSS 2.0 or Atom.
+    """
+    entries: List[SimpleNamespace] = []
+    try:
+        events = etree.iterparse(
+            io.BytesIO(feed_bytes), events=("start", "end"), resolve_entities=False, no_network=True
+        )
+        _, root = next(events)
+        if root.tag not in ("rss", f"{_ATOM}feed"):
+            return None
+        for event, elem in events:
+            if event == "end" and (builder := _ENTRY_BUILDERS.get(elem.tag)):
+                entries.append(builder(elem))
+                elem.clear(keep_tail=True)
+    except (etree.XMLSyntaxError, StopIteration):
+        return None
+    return entries
+
+
+def _parse_feed(feed_bytes: bytes) -> List[Any]:
+    """
+    Parses a feed into feedparser-style entries.
+
+    The lxml parser handles plain RSS 2.0 and Atom feeds. Anything else (RSS 1.0,
+    broken XML, exotic encodings) is handed to the slower but more lenient feedparser.
+
+    Raises:
+        ValueError: If feedparser reports the feed as malformed.
+    """
+    entries = _parse_feed_lxml(feed_bytes)
+    if entries is not None:
+        return entries
+
+    # Fallback only, so feedparser is not imported for feeds lxml can read.
+    import feedparser
+    feed = feedparser.parse(feed_bytes)
+    if feed.bozo:
+        raise ValueError(f"Malformed feed: {getattr(feed, 'bozo_exception', 'Unknown parsing error')}")
+    return feed.entries
+
+
+# --- Conditional Request Cache ---
+def load_feed_cache(cache_path: Optional[Path]) -> FeedCache:
+    """
+    Loads the ETag/Last-Modified validators saved by the previous run.
+
+    A missing or unreadable cache is not an error: every feed is simply fetched in full.
+    """
+    if cache_path is None:
+        return {}
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.warning("Could not read feed cache at '%s', ignoring it. Reason: %s", cache_path, e)
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_feed_cache(cache_path: Optional[Path], feed_cache: FeedCache) -> None:
+    """Persists the feed validators so the next run can send conditional requests."""
+    if cache_path is None:
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(feed_cache, f, indent=2, sort_keys=True)
+    except OSError as e:
+        logging.warning("Could not save feed cache to '%s'. Reason: %s", cache_path, e)
+
+
+def restore_feed_validators(feed_cache: FeedCache, previous_feed_cache: FeedCache, feed_urls: Iterable[str]) -> None:
+    """
+    Puts back the validators the given feeds had before this run.
+
+    Used for feeds with articles that could not be analyzed: the next run then
+    fetches them in full instead of getting a 304 that would hide those articles.
+    """
+    for feed_url in feed_urls:
+        if feed_url in previous_feed_cache:
+            feed_cache[feed_url] = previous_feed_cache[feed_url]
+        else:
+            feed_cache.pop(feed_url, None)
+
+
+def _conditional_headers(validators: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """Builds If-None-Match / If-Modified-Since headers from a feed's cached validators."""
+    if not validators:
+        return None
+    headers = {}
+    if etag := validators.get("etag"):
+        headers["If-None-Match"] = etag
+    if last_modified := validators.get("last_modified"):
+        headers["If-Modified-Since"] = last_modified
+    return headers or None
+
+
+async def fetch_from_rss_async(
+        client: ClientSession, config: AppConfig, source_url: str, feed_cache: Optional[FeedCache] = None
+) -> List[Article]:
+    """
+    Asynchronously fetches and filters recent articles from a single RSS feed.
+
+    When a feed cache is given, the request is conditional on the validators from
+    the previous fetch. An unchanged feed answers 304 with no body and is skipped
+    without parsing; on a full response the cache entry is refreshed in place.
+    """
     logging.info(f"Scanning RSS feed: {source_url}")
     found_articles: List[Article] = []
 
@@ -54,35 +288,62 @@ async def fetch_from_rss_async(client: ClientSession, config: AppConfig, source_
     ssl_context = should_verify_ssl_for_url(source_url, skip_ssl_domains)
 
     try:
-        async with (client.get(source_url, ssl=ssl_context, timeout=timeout) as response):
+        request_headers = _conditional_headers(feed_cache.get(source_url)) if feed_cache is not None else None
+        async with (client.get(source_url, ssl=ssl_context, timeout=timeout, headers=request_headers) as response):
+            if response.status == 304:
+                logging.info(f"RSS feed not modified since last run: {source_url}")
+                return []
             response.raise_for_status()
-            feed_content = await response.text()
 
-            # feedparser can be slow, run it in an executor to avoid blocking the event loop
-            loop = asyncio.get_running_loop()
-            feed = await loop.run_in_executor(None, lambda: feedparser.parse(feed_content))
+            # Raw bytes: the XML declaration, not a guessed charset, decides the encoding.
+            feed_content = await response.read()
 
-            if feed.bozo:
-                raise Exception(f"Malformed feed: {getattr(feed, 'bozo_exception', 'Unknown parsing error')}")
+            # Parsing is CPU-bound, run it in an executor to avoid blocking the event loop
+            loop = asyncio.get_running_loop()
+            entries = await loop.run_in_executor(None, _parse_feed, feed_content)
+
+            # Only stored once the feed has been read and parsed; otherwise the next
+            # run's 304 would hide entries this run never saw.
+            if feed_cache is not None:
+                validators = {
+                    key: value for key, value in (
+                        ("etag", response.headers.get("ETag")),
+                        ("last_modified", response.headers.get("Last-Modified")),
+                    ) if value
+                }
+                if validators:
+                    feed_cache[source_url] = validators
+                else:
+                    feed_cache.pop(source_url, None)
 
             # Calculate the cutoff time for recent articles
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+            # Compared as epoch seconds, so old entries are rejected without building a datetime.
+            # Feeds are not guaranteed to be sorted, so every entry is checked.
+            cutoff_epoch = cutoff_time.timestamp()
 
-            for entry in feed.entries:
-                published_time_utc = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_time_utc = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+            for entry in entries:
+                published_parsed = getattr(entry, 'published_parsed', None)
+                if not published_parsed:
+                    continue
+                published_epoch = calendar.timegm(published_parsed[:6])
 
-                if published_time_utc and published_time_utc >= cutoff_time:
+                if published_epoch >= cutoff_epoch:
+                    published_time_utc = datetime.fromtimestamp(published_epoch, timezone.utc)
                     tags_list = getattr(entry, 'tags', [])
                     tags = [tag.term.lower() for tag in tags_list if hasattr(tag, 'term')]
+                    # Most feeds already use absolute links; only relative ones need resolving.
+                    link = entry.link
+                    if not link.startswith(_ABSOLUTE_URL_PREFIXES):
+                        link = urljoin(source_url, link)
                     article = {
                         "title": entry.title,
-                        "link": urljoin(source_url, entry.link),
+                        "link": link,
                         "published": published_time_utc.isoformat(),
                         "summary": _extract_summary(entry),
                         "tags": tags,
-                        "source": "RSS"
+                        "source": "RSS",
+                        "feed": source_url
                     }
                     found_articles.append(article)
 
@@ -111,7 +372,7 @@ async def fetch_from_github_releases_async(client: ClientSession, config: AppCon
     try:
         async with client.get(api_url, timeout=DEFAULT_SCOUT_TIMEOUT) as response:
             response.raise_for_status()
-            releases = await response.json()
+            releases = _json_loads(await response.read())
 
             for release in releases:
                 # Ensure published_at exists and is a valid ISO 8601 string
@@ -124,7 +385,8 @@ async def fetch_from_github_releases_async(client: ClientSession, config: AppCon
                     article = {
                         "title": f"GitHub Release: {release.get('name') or release.get('tag_name', 'N/A')}",
                         "link": release.get('html_url', '#'),
-                        "published": published_time.isoformat(),
+                        # GitHub already sends ISO 8601, so the original string is kept as-is.
+                        "published": published_at_str,
                         "summary": (release.get('body', 'No release notes.') or "")[:800] + '...',
                         "tags": ["github", "release", repo.split('/')[-1]],
                         "source": "GitHub Release"
@@ -150,8 +412,17 @@ SOURCE_FETCHER_MAP: Dict[str, Callable[[ClientSession, AppConfig, str], Coroutin
 }
 
 
-async def run_scout_async(config: AppConfig, github_token: Optional[str]) -> List[Article]:
-    """Asynchronously runs the full scouting process based on the configuration."""
+async def run_scout_async(
+        config: AppConfig, github_token: Optional[str], feed_cache: Optional[FeedCache] = None
+) -> List[Article]:
+    """
+    Asynchronously runs the full scouting process based on the configuration.
+
+    Args:
+        config: The application configuration.
+        github_token: Optional token for the GitHub API.
+        feed_cache: Optional RSS validators from the previous run, updated in place.
+    """
     logging.info("=" * 80)
     logging.info("Scout Module: Concurrently searching for new articles...")
     logging.info("=" * 80)
@@ -166,12 +437,15 @@ async def run_scout_async(config: AppConfig, github_token: Optional[str]) -> Lis
     all_articles: List[Article] = []
     data_sources = config.data_sources.model_dump()
 
-    async with aiohttp.ClientSession(headers=headers) as session:
+    async with aiohttp.ClientSession(headers=headers, connector=create_tcp_connector()) as session:
         tasks = []
         for source_type, sources_list in data_sources.items():
             if fetcher_func := SOURCE_FETCHER_MAP.get(source_type):
                 for source_item in sources_list:
-                    tasks.append(fetcher_func(session, config, source_item))
+                    if source_type == "rss_feeds" and feed_cache is not None:
+                        tasks.append(fetcher_func(session, config, source_item, feed_cache=feed_cache))
+                    else:
+                        tasks.append(fetcher_func(session, config, source_item))
             else:
                 logging.warning(f"Unknown data source type '{source_type}' in config. Skipping.")
 
@@ -183,6 +457,8 @@ async def run_scout_async(config: AppConfig, github_token: Optional[str]) -> Lis
     logging.info(f"Scout finished. Total articles/links found: {len(all_articles)}")
     return all_articles
 
-def run_scout(config: AppConfig, github_token: Optional[str] = None) -> List[Article]:
+def run_scout(
+        config: AppConfig, github_token: Optional[str] = None, feed_cache: Optional[FeedCache] = None
+) -> List[Article]:
     """Synchronous wrapper to run the async scout function."""
-    return asyncio.run(run_scout_async(config, github_token=github_token))
+    return asyncio.run(run_scout_async(config, github_token=github_token, feed_cache=feed_cache))
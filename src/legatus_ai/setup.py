@@ -1,4 +1,5 @@
 import logging
+import os
 import shutil
 import sys
 
@@ -11,6 +12,13 @@ INTERNAL_CONFIG_EXAMPLE = APP_ROOT / "config.yaml.example"
 # We expect the user to mount their current directory to this path.
 TARGET_DIR = APP_ROOT / "target"
 
+ENV_TEMPLATE = (
+    "# GitHub Token (Optional, if you are not worrying about API quota)\n"
+    "# GITHUB_TOKEN=\n\n"
+    "# Google Cloud Credentials (Optional)\n"
+    "# GOOGLE_APPLICATION_CREDENTIALS=/app/gcp-creds.json\n"
+)
+
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
 
@@ -20,7 +28,11 @@ def bootstrap_project():
     """
     print(f"Initializing Legatus AI project in: {TARGET_DIR}\n")
 
-    if not TARGET_DIR.exists():
+    # One directory listing answers every "already exists?" check below.
+    try:
+        with os.scandir(TARGET_DIR) as it:
+            existing = {entry.name for entry in it}
+    except OSError:
         logging.error("   Error: /target directory does not exist.")
         logging.error("   You must mount your current directory to /target.")
         logging.error("   Example: docker run -v \"$(pwd):/target\" ...")
@@ -34,10 +46,9 @@ def bootstrap_project():
     ]
 
     for dir_name in dirs_to_create:
-        dir_path = TARGET_DIR / dir_name
-        if not dir_path.exists():
+        if dir_name not in existing:
             try:
-                dir_path.mkdir(parents=True, exist_ok=True)
+                (TARGET_DIR / dir_name).mkdir(exist_ok=True)
                 logging.info(f"Created directory: {dir_name}/")
             except OSError as e:
                 logging.error(f"Failed to create {dir_name}: {e}")
@@ -46,7 +57,7 @@ def bootstrap_project():
 
     # 2. Copy config example file
     target_config = TARGET_DIR / "config.yaml.example"
-    if not target_config.exists():
+    if target_config.name not in existing:
         try:
             if INTERNAL_CONFIG_EXAMPLE.exists():
                 shutil.copy(INTERNAL_CONFIG_EXAMPLE, target_config)
@@ -60,13 +71,9 @@ def bootstrap_project():
 
     # 3. Create .env template
     target_env = TARGET_DIR / ".env"
-    if not target_env.exists():
+    if target_env.name not in existing:
         try:
-            with open(target_env, 'w') as f:
-                f.write("# GitHub Token (Optional, if you are not worrying about API quota)\n")
-                f.write("# GITHUB_TOKEN=\n\n")
-                f.write("# Google Cloud Credentials (Optional)\n")
-                f.write("# GOOGLE_APPLICATION_CREDENTIALS=/app/gcp-creds.json\n")
+            target_env.write_text(ENV_TEMPLATE)
             logging.info(f"Created template .env file")
         except OSError as e:
             logging.error(f"Failed to create .env file: {e}")
@@ -1,22 +1,67 @@
 import asyncio
-import json
 import logging
-import re
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from typing import Annotated, List, Dict, Any, Optional, Set
+from urllib.parse import urlparse
 
 import aiohttp
-import trafilatura
 from aiohttp import ClientSession
-from google.auth.aio.transport import aiohttp
 from langchain_core.runnables import Runnable
+from pydantic import BaseModel, BeforeValidator, ConfigDict, ValidationError
 
 from .config import AppConfig
-from .utils import should_verify_ssl_for_url
+from .utils import create_tcp_connector, should_verify_ssl_for_url
 
 # A simple type alias for clarity
 Article = Dict[str, Any]
 AnalysisResult = Dict[str, Any]
 
+# Article pages fetched at once from any single host. Fetches from different hosts
+# are not limited against each other; concurrency_limit only bounds the LLM calls.
+FETCH_CONCURRENCY_PER_HOST = 4
+
+# Opening and closing markers of a markdown ```json ... ``` block.
+_JSON_FENCE_OPEN = '```json'
+_FENCE_CLOSE = '```'
+
+
+def _to_int_or_none(v: object) -> object:
+    """LLMs sometimes return the score as a string or float; unparseable values become ``None``."""
+    if v is None or isinstance(v, int):
+        return v
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_bool(v: object) -> object:
+    """LLMs sometimes answer ``null`` or a word instead of a JSON boolean; ``null`` means not relevant."""
+    if v is None:
+        return False
+    if isinstance(v, str):
+        return v.strip().lower() in ("true", "yes", "y", "1")
+    return bool(v)
+
+
+def _to_str_or_none(v: object) -> object:
+    """Text fields sometimes come back as numbers or lists; they are kept as their string form."""
+    if v is None or isinstance(v, str):
+        return v
+    return str(v)
+
+
+class Analysis(BaseModel):
+    """The assessment the LLM returns for a single article (see ``prompt_legatus.txt``)."""
+
+    # Extra keys the model adds are kept, so they still reach the JSON report.
+    model_config = ConfigDict(extra="allow")
+
+    is_relevant: Annotated[bool, BeforeValidator(_to_bool)] = False
+    summary: Annotated[Optional[str], BeforeValidator(_to_str_or_none)] = None
+    criticality_score: Annotated[Optional[int], BeforeValidator(_to_int_or_none)] = None
+    justification: Annotated[Optional[str], BeforeValidator(_to_str_or_none)] = None
+
 
 async def _fetch_and_parse_article_content_async(session: ClientSession, url: str, config: AppConfig) -> Optional[
     str]:
@@ -38,10 +83,14 @@ async def _fetch_and_parse_article_content_async(session: ClientSession, url: st
     try:
         async with session.get(url, headers=headers, ssl=ssl_context, timeout=spec_cfg.timeout) as response:
             response.raise_for_status()
-            html_content = await response.text()
+            # Raw bytes: trafilatura detects the encoding itself, so aiohttp's charset guess is skipped.
+            html_content = await response.read()
+
+            # trafilatura pulls in its own stack of parsers, so it is only imported once needed.
+            import trafilatura
 
             loop = asyncio.get_running_loop()
-            text_content = await loop.run_in_executor(None, lambda: trafilatura.extract(html_content))
+            text_content = await loop.run_in_executor(None, trafilatura.extract, html_content)
             return text_content or None
     except asyncio.TimeoutError:
         logging.error(f"Timeout while fetching article content from {url}.")
@@ -52,9 +101,63 @@ async def _fetch_and_parse_article_content_async(session: ClientSession, url: st
     return None
 
 
-def _parse_llm_json_response(raw_response: str, article_title: str) -> Optional[Dict[str, Any]]:
+def _find_fenced_json(text: str) -> Optional[str]:
+    """
+    Returns the JSON object inside the first ```json block that holds one, or None.
+
+    Plain substring searches keep this linear in the response length, however
+    many fences the response contains.
+    """
+    start = text.find(_JSON_FENCE_OPEN)
+    while start != -1:
+        body_start = start + len(_JSON_FENCE_OPEN)
+        end = text.find(_FENCE_CLOSE, body_start)
+        if end == -1:
+            return None
+        body = text[body_start:end].strip()
+        if body.startswith('{') and body.endswith('}'):
+            return body
+        start = text.find(_JSON_FENCE_OPEN, end + len(_FENCE_CLOSE))
+    return None
+
+
+def _find_json_object(text: str) -> Optional[str]:
     """
-    Cleans and parses a JSON string from an LLM response.
+    Returns the first balanced ``{...}`` object in ``text``, or None.
+
+    A single pass tracks brace depth and skips over string literals, so nested
+    objects and braces inside strings are handled without regex backtracking.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _parse_llm_json_response(raw_response: str, article_title: str) -> Optional[Analysis]:
+    """
+    Cleans, parses and validates a JSON object from an LLM response.
 
     Handles responses that may be wrapped in markdown code fences.
 
@@ -63,21 +166,25 @@ def _parse_llm_json_response(raw_response: str, article_title: str) -> Optional[
         article_title: The title of the article, for logging purposes.
 
     Returns:
-        A parsed dictionary, or None if parsing fails.
+        The validated Analysis, or None if parsing fails.
     """
+    # Both providers run in JSON mode, so the reply is normally the bare object and
+    # can be validated as-is, without scanning it for an embedded object first.
+    try:
+        return Analysis.model_validate_json(raw_response)
+    except ValidationError:
+        pass
 
-    # Regex to find a JSON object within markdown ```json ... ``` blocks or as a standalone object.
-    match = re.search(r'```json\s*(\{.*?\})\s*```|(\{.*?\})', raw_response, re.DOTALL)
-    if not match:
+    # Prioritize the content of a ```json block if present, otherwise take the first standalone object.
+    json_string = _find_fenced_json(raw_response) or _find_json_object(raw_response)
+    if json_string is None:
         logging.error(f"No valid JSON object found in LLM response for '{article_title}'. Response: {raw_response}")
         return None
 
-    # Prioritize the content of a json block if present, otherwise take the standalone json
-    json_string = match.group(1) if match.group(1) else match.group(2)
-
     try:
-        return json.loads(json_string)
-    except json.JSONDecodeError as e:
+        # Parsed and validated in one step by pydantic-core, without an intermediate dict.
+        return Analysis.model_validate_json(json_string)
+    except ValidationError as e:
         logging.error(
             f"Failed to parse JSON from LLM for '{article_title}'. Error: {e}\nInvalid JSON string: {json_string}")
         return None
@@ -89,20 +196,28 @@ async def _analyze_single_article(
         ai_chain: Runnable,
         config: AppConfig,
         semaphore: asyncio.Semaphore,
+        host_semaphores: Dict[str, asyncio.Semaphore],
+        failed_links: Optional[Set[str]] = None,
 ) -> Optional[AnalysisResult]:
     """
     Analyzes a single article by fetching its content and invoking the AI chain.
-    Uses a semaphore to limit concurrency.
+
+    The fetch is limited per host, so a slow site only holds up its own articles,
+    while the semaphore limits concurrent LLM calls. If the fetch or the LLM call
+    fails, the article's link is added to ``failed_links``.
     """
-    async with semaphore:
-        logging.info(f"Analyzing article: '{article.get('title', 'Untitled')}'")
+    logging.info(f"Analyzing article: '{article.get('title', 'Untitled')}'")
+    async with host_semaphores[urlparse(article['link']).netloc]:
         full_text = await _fetch_and_parse_article_content_async(session, article['link'], config)
-        if not full_text:
-            logging.warning(f"Skipping analysis for '{article['title']}' due to content fetch failure.")
-            return None
+    if not full_text:
+        logging.warning(f"Skipping analysis for '{article['title']}' due to content fetch failure.")
+        if failed_links is not None:
+            failed_links.add(article['link'])
+        return None
 
-        logging.debug(f"Fetched content for '{article['title']}' (first 200 chars): {full_text[:200]}...")
+    logging.debug(f"Fetched content for '{article['title']}' (first 200 chars): {full_text[:200]}...")
 
+    async with semaphore:
         try:
             prompt_data = {
                 "title": article.get('title', ''),
@@ -112,9 +227,13 @@ async def _analyze_single_article(
             raw_response = await ai_chain.ainvoke(prompt_data)
             logging.debug(f"Raw LLM Response for '{article['title']}':\n---\n{raw_response}\n---")
 
-            parsed_json = _parse_llm_json_response(raw_response, article['title'])
-            if parsed_json and parsed_json.get('is_relevant'):
-                return {"title": article['title'], "link": article['link'], "analysis": parsed_json}
+            analysis = _parse_llm_json_response(raw_response, article['title'])
+            if analysis is None and failed_links is not None:
+                failed_links.add(article['link'])
+            if analysis and analysis.is_relevant:
+                # Fields the LLM left out stay absent, so report and archive defaults apply.
+                return {"title": article['title'], "link": article['link'],
+                        "analysis": analysis.model_dump(exclude_none=True)}
             else:
                 logging.info(f"LLM determined '{article['title']}' is not relevant. Discarding.")
                 return None
@@ -122,31 +241,58 @@ async def _analyze_single_article(
         except Exception as e:
             # This catches errors from ainvoke (e.g., API key issues, network problems)
             logging.error(f"Error during AI analysis for '{article['title']}'. Reason: {e}")
+            if failed_links is not None:
+                failed_links.add(article['link'])
             return None
 
 
 async def run_speculator_async(
         articles: List[Article],
         ai_chain: Runnable,
-        config: AppConfig
+        config: AppConfig,
+        session: Optional[ClientSession] = None,
+        failed_links: Optional[Set[str]] = None,
 ) -> List[AnalysisResult]:
     """
     Asynchronously analyzes a list of relevant articles to produce summaries and scores.
     Controls concurrency to avoid overwhelming services.
+
+    Args:
+        articles: The relevant articles to analyze.
+        ai_chain: The LLM chain used for the analysis.
+        config: The validated application configuration.
+        session: An open session to fetch article content with, so its pooled
+            connections can be reused. If omitted, one is created for this run.
+        failed_links: Optional set that receives the links of articles whose
+            content could not be fetched or whose analysis failed.
     """
     logging.info("=" * 80)
     logging.info("Speculator Module: Concurrently analyzing relevant articles...")
     logging.info("=" * 80)
 
+    # Sources can overlap (e.g. a release mirrored to a feed); each link is fetched and analyzed once.
+    unique_articles: Dict[str, Article] = {}
+    for article in articles:
+        unique_articles.setdefault(article['link'], article)
+
     concurrency_limit = config.speculator_settings.concurrency_limit
     semaphore = asyncio.Semaphore(concurrency_limit)
+    host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(FETCH_CONCURRENCY_PER_HOST)
+    )
 
-    async with ClientSession() as session:
+    async def _analyze_all(client: ClientSession) -> List[Optional[AnalysisResult]]:
         tasks = [
-            _analyze_single_article(session, article, ai_chain, config, semaphore)
-            for article in articles
+            _analyze_single_article(client, article, ai_chain, config, semaphore, host_semaphores, failed_links)
+            for article in unique_articles.values()
         ]
-        results = await asyncio.gather(*tasks)
+        return await asyncio.gather(*tasks)
+
+    if session is not None:
+        results = await _analyze_all(session)
+    else:
+        async with ClientSession(connector=create_tcp_connector()) as own_session:
+            results = await _analyze_all(own_session)
 
     # Filter out any None results from failed analyses
     final_analyses = [res for res in results if res is not None]
@@ -154,10 +300,12 @@ async def run_speculator_async(
     return final_analyses
 
 
-def run_speculator(articles: List[Article], ai_chain: Runnable, config: AppConfig) -> List[AnalysisResult]:
+def run_speculator(
+        articles: List[Article], ai_chain: Runnable, config: AppConfig, failed_links: Optional[Set[str]] = None
+) -> List[AnalysisResult]:
     """Synchronous wrapper to run the async speculator function."""
     # Ensure ai_chain is a Runnable, as the old version had 'Any'
     if not isinstance(ai_chain, Runnable):
         logging.error("Speculator received an invalid AI chain object. Cannot proceed.")
         return []
-    return asyncio.run(run_speculator_async(articles, ai_chain, config))
+    return asyncio.run(run_speculator_async(articles, ai_chain, config, failed_links=failed_links))
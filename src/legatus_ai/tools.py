@@ -1,16 +1,42 @@
 import asyncio
 import logging
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Tuple
 
 import aiohttp
-import trafilatura
-from langchain_community.tools import QuerySQLDatabaseTool
-from langchain_community.utilities import SQLDatabase
 from langchain_core.tools import Tool
 
 from .config import AppConfig
-from .utils import should_verify_ssl_for_url
+from .utils import create_tcp_connector, should_verify_ssl_for_url
+
+
+# --- Shared HTTP Session ---
+# One session per event loop, so repeated fetches reuse pooled keep-alive
+# connections and cached DNS lookups instead of a fresh connector per URL.
+_shared_session: Optional[Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = None
+
+
+def _get_shared_session() -> aiohttp.ClientSession:
+    """
+    Returns the web fetcher's session for the running loop, creating it on first use.
+
+    Creation has no await point, so concurrent callers on the same loop cannot race.
+    A session left over from another (finished) loop is replaced.
+    """
+    global _shared_session
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session[0] is not loop or _shared_session[1].closed:
+        _shared_session = (loop, aiohttp.ClientSession(connector=create_tcp_connector()))
+    return _shared_session[1]
+
+
+async def close_shared_session() -> None:
+    """Closes the web fetcher's session, if one was opened on the running loop."""
+    global _shared_session
+    if _shared_session is not None and _shared_session[0] is asyncio.get_running_loop():
+        await _shared_session[1].close()
+    _shared_session = None
 
 
 def create_web_fetcher_tool(config: AppConfig) -> Tool:
@@ -48,21 +74,26 @@ def create_web_fetcher_tool(config: AppConfig) -> Tool:
         ssl_context = should_verify_ssl_for_url(url, skip_ssl_domains)
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=timeout, ssl=ssl_context) as response:
-                    response.raise_for_status()
-                    html_content = await response.text()
-
-                    loop = asyncio.get_running_loop()
-                    text_content = await loop.run_in_executor(
-                        None, lambda: trafilatura.extract(html_content, include_comments=False, include_tables=False)
-                    )
-
-                    if text_content:
-                        return text_content
-                    else:
-                        logging.warning(f"trafilatura could not extract content from {url}")
-                        return "Content could not be extracted from the page. It might be a video, a PDF, or a JavaScript-heavy site."
+            session = _get_shared_session()
+            async with session.get(url, headers=headers, timeout=timeout, ssl=ssl_context) as response:
+                response.raise_for_status()
+                # Raw bytes: trafilatura detects the encoding itself, so aiohttp's charset guess is skipped.
+                html_content = await response.read()
+
+                # trafilatura pulls in its own stack of parsers, so it is only imported once needed.
+                import trafilatura
+
+                loop = asyncio.get_running_loop()
+                text_content = await loop.run_in_executor(
+                    None,
+                    partial(trafilatura.extract, html_content, include_comments=False, include_tables=False)
+                )
+
+                if text_content:
+                    return text_content
+                else:
+                    logging.warning(f"trafilatura could not extract content from {url}")
+                    return "Content could not be extracted from the page. It might be a video, a PDF, or a JavaScript-heavy site."
 
         except asyncio.TimeoutError:
             logging.error(f"Timeout while fetching content from {url}.")
@@ -121,6 +152,10 @@ def create_sql_query_tool(db_path: Path) -> Tool:
             description=f"This tool is currently disabled. {error_message}"
         )
 
+    # The SQL toolkit loads SQLAlchemy, so it is only imported once a database exists.
+    from langchain_community.tools import QuerySQLDatabaseTool
+    from langchain_community.utilities import SQLDatabase
+
     db = SQLDatabase.from_uri(f"sqlite:///{db_path}")
     sql_tool = QuerySQLDatabaseTool(db=db)
 
@@ -1,12 +1,24 @@
 import logging
 import os
 import ssl
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Tuple
 from urllib.parse import urlparse
 
+import aiohttp
 import certifi
 
+try:
+    # aiodns lets aiohttp resolve hosts on c-ares instead of getaddrinfo in a thread pool.
+    import aiodns  # noqa: F401
+    _HAS_AIODNS = True
+except ImportError:  # optional; aiohttp's threaded resolver is used instead
+    _HAS_AIODNS = False
+
+# Resolved addresses are reused for this long across requests to the same host.
+DNS_CACHE_TTL = 300  # seconds
+
 # --- SSL Context Caching ---
 # We cache the secure SSL context because it's the same for all secure requests.
 # This avoids the small overhead of recreating it every time.
@@ -28,6 +40,24 @@ def _get_secure_ssl_context() -> ssl.SSLContext:
     return _secure_ssl_context
 
 
+@lru_cache(maxsize=4096)
+def _skips_ssl_verification(domain: str, domains_to_skip: Tuple[str, ...]) -> bool:
+    """
+    Decides, once per host, whether it matches a domain in the skip list.
+
+    Cached because every request to the same host gets the same answer, which also
+    means the warning below is logged once per host rather than once per request.
+    """
+    if any(skip_domain in domain for skip_domain in domains_to_skip):
+        logging.warning(
+            "Disabling SSL certificate verification for domain '%s' as it "
+            "matches a domain in the skip list. This is a security risk and should only be "
+            "used for trusted sites with known certificate issues.", domain
+        )
+        return True
+    return False
+
+
 def should_verify_ssl_for_url(url: str, domains_to_skip: List[str]) -> Union[ssl.SSLContext, bool]:
     """
     Determines the appropriate SSL context for a given URL based on security settings.
@@ -56,18 +86,27 @@ def should_verify_ssl_for_url(url: str, domains_to_skip: List[str]) -> Union[ssl
         # If URL parsing fails for some reason, default to being secure.
         return _get_secure_ssl_context()
 
-    # Using a generator expression with any() is a clean and efficient way to check for membership.
-    if any(skip_domain in domain for skip_domain in domains_to_skip):
-        logging.warning(
-            f"Disabling SSL certificate verification for URL '{url}' as its domain '{domain}' "
-            "matches a domain in the skip list. This is a security risk and should only be "
-            "used for trusted sites with known certificate issues."
-        )
+    if _skips_ssl_verification(domain, tuple(domains_to_skip)):
         return False
 
     return _get_secure_ssl_context()
 
 
+# --- HTTP Connectors ---
+def create_tcp_connector() -> aiohttp.TCPConnector:
+    """
+    Creates the connector shared by a module's HTTP session.
+
+    Lookups go through c-ares when aiodns is installed, so many distinct hosts
+    resolve in parallel without tying up executor threads, and are cached for
+    DNS_CACHE_TTL rather than aiohttp's default of 10 seconds.
+
+    Must be called with an event loop running.
+    """
+    resolver = aiohttp.AsyncResolver() if _HAS_AIODNS else None
+    return aiohttp.TCPConnector(resolver=resolver, ttl_dns_cache=DNS_CACHE_TTL)
+
+
 def get_project_root() -> Path:
     """
     Determines the project root path.
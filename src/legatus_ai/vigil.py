@@ -1,39 +1,397 @@
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
 
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
 
-from .config import AppConfig
-from .constants import DEFAULT_EMBEDDING_MODEL, DEFAULT_SIMILARITY_THRESHOLD
+from .config import AISettings, AppConfig
+from .constants import (
+    DEFAULT_EMBEDDING_BACKEND, DEFAULT_EMBEDDING_DEVICE, DEFAULT_EMBEDDING_MODEL, DEFAULT_MAX_TORCH_THREADS,
+    DEFAULT_SIMILARITY_THRESHOLD, EMBEDDING_DEVICE_ENV_VAR, TORCH_THREADS_ENV_VAR
+)
+
+logger = logging.getLogger(__name__)
 
 # A simple type alias for clarity
 Article = Dict[str, Any]
 
-_model_cache: Optional[SentenceTransformer] = None
+# The loaded model and the (model name, backend, device, dtype) it was loaded for.
+# Kept as one tuple so a reader never sees a model paired with another model's key.
+_model_cache: Optional[Tuple[Tuple[str, str, str, Optional[str]], SentenceTransformer]] = None
+_model_lock = threading.Lock()
+
+# Int8-quantized exports published alongside the standard sentence-transformers models.
+# The ONNX file uses AVX-512 VNNI kernels; the OpenVINO one runs on any recent x86 CPU.
+_QUANTIZED_MODEL_FILES = {
+    "onnx": "onnx/model_qint8_avx512_vnni.onnx",
+    "openvino": "openvino/openvino_model_qint8_quantized.xml",
+}
+
+# Weight dtypes accepted by ai_settings.embedding_dtype for the PyTorch backend.
+_EMBEDDING_DTYPES = {
+    "float32": torch.float32,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+}
+
+
+def configure_torch_threads():
+    """
+    Sets the number of CPU threads PyTorch uses for inference.
+
+    PyTorch sizes its pool from the host's cores, which oversubscribes CPU-limited
+    containers, while a model this small stops scaling after a few threads. The
+    count can be overridden with the LEGATUS_TORCH_THREADS environment variable.
+
+    The setting only applies to the calling thread, so call it on the thread that
+    encodes, not on one that merely loads the model.
+    """
+    default_threads = min(DEFAULT_MAX_TORCH_THREADS, os.cpu_count() or 1)
+    try:
+        num_threads = int(os.getenv(TORCH_THREADS_ENV_VAR, default_threads))
+    except ValueError:
+        logger.warning("Ignoring invalid %s value, using %s threads.", TORCH_THREADS_ENV_VAR, default_threads)
+        num_threads = default_threads
+    torch.set_num_threads(max(1, num_threads))
+
+
+def _resolve_embedding_device(device: Optional[str]) -> str:
+    """
+    Picks the device for the embedding model: LEGATUS_EMBEDDING_DEVICE, then the
+    configured device, then the CPU.
+
+    sentence-transformers would otherwise move the model to any visible GPU,
+    competing for memory with a local LLM.
+    """
+    return os.getenv(EMBEDDING_DEVICE_ENV_VAR) or device or DEFAULT_EMBEDDING_DEVICE
+
 
+def _load_model(model_name: str, backend: str, device: str, dtype: Optional[str]) -> SentenceTransformer:
+    """
+    Loads the model on the requested backend, falling back to PyTorch.
 
-def _get_embedding_model(model_name: str) -> SentenceTransformer:
+    The ONNX and OpenVINO backends need the optional ``sentence-transformers[onnx]``
+    or ``[openvino]`` extras and a quantized export of the model on the Hub. If
+    either is missing, the regular PyTorch model is loaded instead. ``dtype`` only
+    applies to the PyTorch model; its embeddings are still returned as float32.
+    """
+    if backend in _QUANTIZED_MODEL_FILES:
+        try:
+            return SentenceTransformer(
+                model_name, device=device, backend=backend,
+                model_kwargs={"file_name": _QUANTIZED_MODEL_FILES[backend]}
+            )
+        except Exception as e:
+            logger.warning(
+                "Could not load '%s' with the %s backend, using PyTorch instead. Reason: %s", model_name, backend, e)
+    elif backend != DEFAULT_EMBEDDING_BACKEND:
+        logger.warning("Unknown embedding backend '%s', using PyTorch instead.", backend)
+    if dtype is not None:
+        if dtype in _EMBEDDING_DTYPES:
+            return SentenceTransformer(
+                model_name, device=device, model_kwargs={"dtype": _EMBEDDING_DTYPES[dtype]})
+        logger.warning("Unknown embedding dtype '%s', using the model's default instead.", dtype)
+    return SentenceTransformer(model_name, device=device)
+
+
+def _get_embedding_model(
+        model_name: str,
+        backend: str = DEFAULT_EMBEDDING_BACKEND,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None
+) -> SentenceTransformer:
     """
     Loads and caches the SentenceTransformer model.
 
     Args:
         model_name: The name of the model to load from Hugging Face.
+        backend: 'torch' (default), or 'onnx' / 'openvino' for int8-quantized CPU inference.
+        device: The device to run the model on. Defaults to the CPU.
+        dtype: Optional weight dtype for the PyTorch model: 'float32', 'float16' or 'bfloat16'.
 
     Returns:
         An instance of the SentenceTransformer model.
     """
     global _model_cache
-    if _model_cache is None or _model_cache.model_name_or_path != model_name:
-        logging.info(f"Loading embedding model '{model_name}'... (This may take a moment on first run)")
+    key = (model_name, backend, _resolve_embedding_device(device), dtype)
+    if (cached := _model_cache) is not None and cached[0] == key:
+        return cached[1]
+
+    # Double-checked so that concurrent callers load the model only once.
+    with _model_lock:
+        if _model_cache is None or _model_cache[0] != key:
+            logger.info(
+                "Loading embedding model '%s' on %s... (This may take a moment on first run)", model_name, key[2])
+            try:
+                _model_cache = (key, _load_model(*key))
+            except Exception as e:
+                logger.error("Failed to load SentenceTransformer model '%s'. Error: %s", model_name, e)
+                raise
+        return _model_cache[1]
+
+
+# --- Article Embedding Cache ---
+# Feeds keep listing the same articles for days, so their embeddings are stored
+# by a digest of (model, backend, text) and only unseen texts reach the model.
+# Vectors are kept as symmetric int8 with a per-vector scale, a quarter of the
+# float32 size with a cosine error around 1e-3, far below any useful threshold.
+# Entries not seen for the retention period are pruned.
+EMBEDDING_CACHE_TABLE = "article_embeddings"
+EMBEDDING_CACHE_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS {EMBEDDING_CACHE_TABLE} (
+        key BLOB PRIMARY KEY,
+        embedding BLOB NOT NULL,
+        scale REAL NOT NULL,
+        used_at INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+# Per-connection scratch table holding the keys looked up by one Vigil run, so
+# hits are read and touched with one fixed join instead of a query per key.
+CANDIDATE_KEYS_TABLE = "candidate_embedding_keys"
+CANDIDATE_KEYS_SCHEMA = f"CREATE TEMP TABLE IF NOT EXISTS {CANDIDATE_KEYS_TABLE} (key BLOB PRIMARY KEY) WITHOUT ROWID"
+CLEAR_CANDIDATE_KEYS = f"DELETE FROM {CANDIDATE_KEYS_TABLE}"
+INSERT_CANDIDATE_KEY = f"INSERT OR IGNORE INTO {CANDIDATE_KEYS_TABLE} (key) VALUES (?)"
+SELECT_CACHED_EMBEDDINGS = (
+    f"SELECT e.key, e.embedding, e.scale FROM {CANDIDATE_KEYS_TABLE} c "
+    f"JOIN {EMBEDDING_CACHE_TABLE} e ON e.key = c.key"
+)
+TOUCH_CACHED_EMBEDDINGS = (
+    f"UPDATE {EMBEDDING_CACHE_TABLE} SET used_at = ? WHERE key IN (SELECT key FROM {CANDIDATE_KEYS_TABLE})"
+)
+INSERT_CACHED_EMBEDDING = (
+    f"INSERT OR REPLACE INTO {EMBEDDING_CACHE_TABLE} (key, embedding, scale, used_at) VALUES (?, ?, ?, ?)"
+)
+PRUNE_CACHED_EMBEDDINGS = f"DELETE FROM {EMBEDDING_CACHE_TABLE} WHERE used_at < ?"
+EMBEDDING_CACHE_RETENTION_SECONDS = 30 * 24 * 60 * 60
+
+# The cache can always be rebuilt from the model, so unlike the archive it does
+# not wait for writes to reach the disk; a lost write only costs a re-encode.
+EMBEDDING_CACHE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+_cache_connections: Dict[Path, sqlite3.Connection] = {}
+
+# Default encode batch sizes; ai_settings.embedding_batch_size overrides both.
+CPU_ENCODE_BATCH_SIZE = 8
+GPU_ENCODE_BATCH_SIZE = 64
+
+
+def embedding_variant(ai_settings: AISettings) -> str:
+    """Names the backend and weight dtype that produce the configured embeddings, for cache keys."""
+    backend, dtype = ai_settings.embedding_backend, ai_settings.embedding_dtype
+    return f"{backend}:{dtype}" if dtype else backend
+
+
+def embedding_cache_key(model_name: str, variant: str, text: str) -> bytes:
+    """
+    Returns a digest identifying the embedding of ``text`` by ``model_name``.
+
+    Shared by the article and context embedding caches. ``variant`` comes from
+    ``embedding_variant``, since other backends and dtypes embed slightly differently.
+    """
+    return hashlib.blake2b(f"{model_name}\0{variant}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+
+def _get_cache_connection(cache_path: Path) -> sqlite3.Connection:
+    """
+    Returns the shared connection to the article embedding cache, opening it on first use.
+
+    Raises:
+        sqlite3.Error: If the cache cannot be opened or its tables created.
+        OSError: If the cache directory cannot be created.
+    """
+    if (conn := _cache_connections.get(cache_path)) is not None:
+        return conn
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path, check_same_thread=False)
+    try:
+        for pragma in EMBEDDING_CACHE_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute(EMBEDDING_CACHE_SCHEMA)
+        conn.execute(CANDIDATE_KEYS_SCHEMA)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    logger.debug("Article embedding cache opened at '%s'", cache_path)
+    _cache_connections[cache_path] = conn
+    return conn
+
+
+def close_embedding_cache():
+    """Closes the article embedding cache connections. Safe to call more than once."""
+    while _cache_connections:
+        cache_path, conn = _cache_connections.popitem()
         try:
-            _model_cache = SentenceTransformer(model_name)
-        except Exception as e:
-            logging.error(f"Failed to load SentenceTransformer model '{model_name}'. Error: {e}")
-            raise
-    return _model_cache
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Error while closing article embedding cache at '%s': %s", cache_path, e)
+
+
+def _quantize(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantizes each row to int8, returning the rows and their float32 scales."""
+    scales = np.abs(embeddings).max(axis=1).astype(np.float32) / 127.0
+    scales[scales == 0] = 1.0
+    return np.rint(embeddings / scales[:, None]).astype(np.int8), scales
+
+
+def _dequantize(quantized: np.ndarray, scale: float) -> np.ndarray:
+    """Restores a float32 vector from its int8 form."""
+    return quantized.astype(np.float32) * np.float32(scale)
+
+
+def _encode(model: SentenceTransformer, texts: List[str], batch_size: Optional[int]) -> np.ndarray:
+    """
+    Encodes texts into unit-length rows, so cosine similarity becomes a plain dot product.
 
+    Without an explicit batch size, small batches are used on the CPU, where a
+    batch padded to its longest text mostly wastes work, and large ones on a GPU.
+    """
+    if batch_size is None:
+        on_cpu = getattr(model.device, 'type', 'cpu') == 'cpu'
+        batch_size = CPU_ENCODE_BATCH_SIZE if on_cpu else GPU_ENCODE_BATCH_SIZE
+    return model.encode(
+        texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False
+    )
+
+
+def _embed_articles(
+        article_texts: List[str], ai_settings: AISettings, cache_path: Optional[Path]
+) -> Optional[np.ndarray]:
+    """
+    Embeds the article texts, reusing cached embeddings where possible.
+
+    The model is only loaded if at least one text is not cached. A cache that
+    cannot be opened or written is skipped with a warning.
+
+    Returns:
+        One unit-length row per text, or None if the model could not be loaded.
+    """
+    model_name, backend = ai_settings.embedding_model, ai_settings.embedding_backend
+    device, dtype = ai_settings.embedding_device, ai_settings.embedding_dtype
+    batch_size = ai_settings.embedding_batch_size
+    if cache_path is None:
+        try:
+            model = _get_embedding_model(model_name, backend, device, dtype)
+        except Exception:
+            return None
+        return _encode(model, article_texts, batch_size)
+
+    variant = embedding_variant(ai_settings)
+    keys = [embedding_cache_key(model_name, variant, text) for text in article_texts]
+    now = int(time.time())
+    embeddings: Dict[bytes, np.ndarray] = {}
+    try:
+        conn = _get_cache_connection(cache_path)
+        with conn:
+            conn.execute(CLEAR_CANDIDATE_KEYS)
+            conn.executemany(INSERT_CANDIDATE_KEY, ((key,) for key in keys))
+            for key, embedding, scale in conn.execute(SELECT_CACHED_EMBEDDINGS):
+                embeddings[key] = _dequantize(np.frombuffer(embedding, dtype=np.int8), scale)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Article embedding cache unavailable, encoding every article. Reason: %s", e)
+        conn = None
+
+    # Each distinct text is encoded once, even if several feeds carry it.
+    missing = {key: text for key, text in zip(keys, article_texts) if key not in embeddings}
+    logger.info("Reusing %s cached article embeddings; encoding %s.", len(embeddings), len(missing))
+    quantized, scales = np.empty((0, 0), dtype=np.int8), np.empty(0, dtype=np.float32)
+    if missing:
+        try:
+            model = _get_embedding_model(model_name, backend, device, dtype)
+        except Exception:
+            return None
+        quantized, scales = _quantize(_encode(model, list(missing.values()), batch_size))
+        # Scored through the quantized form, so a score does not depend on whether it was a cache hit.
+        embeddings.update(zip(missing, quantized.astype(np.float32) * scales[:, None]))
 
-def filter_articles(articles: List[Article], context: Dict[str, Any], config: AppConfig) -> List[Article]:
+    if conn is not None:
+        try:
+            with conn:
+                conn.execute(TOUCH_CACHED_EMBEDDINGS, (now,))
+                conn.executemany(INSERT_CACHED_EMBEDDING, (
+                    (key, row.tobytes(), float(scale), now) for key, row, scale in zip(missing, quantized, scales)
+                ))
+                conn.execute(PRUNE_CACHED_EMBEDDINGS, (now - EMBEDDING_CACHE_RETENTION_SECONDS,))
+        except sqlite3.Error as e:
+            logger.warning("Could not update the article embedding cache. Reason: %s", e)
+
+    return np.stack([embeddings[key] for key in keys])
+
+
+def _dedupe_by_link(articles: List[Article]) -> List[Article]:
+    """Keeps the first article per link, which matters when the same article is found in multiple RSS feeds."""
+    seen_links: Set[str] = set()
+    unique_articles: List[Article] = []
+    for article in articles:
+        link = article.get('link')
+        if link and link not in seen_links:
+            seen_links.add(link)
+            unique_articles.append(article)
+    return unique_articles
+
+
+def is_filtering_disabled(config: AppConfig) -> bool:
+    """
+    Tells whether Vigil would pass every article through without scoring it.
+
+    Cosine similarity never falls below -1, so such a threshold accepts every
+    article and the model does not need to be loaded at all.
+    """
+    rules = config.analysis_rules
+    return rules.vigil_disable or rules.vigil_similarity_threshold <= -1.0
+
+
+def get_embedding_model(config: AppConfig) -> SentenceTransformer:
+    """
+    Loads the embedding model configured in ``ai_settings``, or reuses the loaded one.
+
+    Args:
+        config: The validated application configuration.
+
+    Returns:
+        An instance of the SentenceTransformer model.
+    """
+    ai_settings = config.ai_settings
+    return _get_embedding_model(
+        ai_settings.embedding_model, ai_settings.embedding_backend,
+        ai_settings.embedding_device, ai_settings.embedding_dtype
+    )
+
+
+def preload_embedding_model(config: AppConfig):
+    """
+    Loads the configured embedding model ahead of its first use.
+
+    Meant to run in a background thread while other stages do I/O. Failures are
+    only logged, since Vigil reports and handles them when it needs the model.
+
+    Args:
+        config: The validated application configuration.
+    """
+    if is_filtering_disabled(config):
+        return
+    try:
+        get_embedding_model(config)
+    except Exception as e:
+        logger.warning("Could not preload the embedding model: %s", e)
+
+
+def filter_articles(
+        articles: List[Article],
+        context: Dict[str, Any],
+        config: AppConfig,
+        embedding_cache_path: Optional[Path] = None
+) -> List[Article]:
     """
     Filters a list of articles using semantic similarity between their embeddings
     and the project's context embedding.
@@ -42,62 +400,72 @@ def filter_articles(articles: List[Article], context: Dict[str, Any], config: Ap
         articles: A list of article dictionaries gathered by the Scout module.
         context: The project context dictionary, which must contain an 'embedding'.
         config: The validated application configuration.
+        embedding_cache_path: Optional SQLite file in which article embeddings are
+            cached between runs. Articles seen before are not re-encoded.
 
     Returns:
         A deduplicated list of articles that are semantically relevant.
     """
-    logging.info("=" * 80)
-    logging.info("Vigilum Module: Performing semantic pre-filtering...")
-    logging.info("=" * 80)
+    logger.info("=" * 80)
+    logger.info("Vigilum Module: Performing semantic pre-filtering...")
+    logger.info("=" * 80)
 
     if not articles:
-        logging.info("No articles to filter.")
+        logger.info("No articles to filter.")
         return []
 
+    similarity_threshold = config.analysis_rules.vigil_similarity_threshold
+    if is_filtering_disabled(config):
+        logger.info("Semantic filtering is disabled. Only deduplicating articles.")
+        final_list = _dedupe_by_link(articles)
+        logger.info("Vigilum finished. Kept %s of %s articles after filtering and deduplication.",
+                    len(final_list), len(articles))
+        return final_list
+
     project_embedding = context.get('embedding')
     if project_embedding is None:
-        logging.error("Project context embedding not found. Skipping filtering.")
+        logger.error("Project context embedding not found. Skipping filtering.")
         return articles
 
     model_name = config.ai_settings.embedding_model
-    similarity_threshold = config.analysis_rules.vigil_similarity_threshold
 
-    try:
-        model = _get_embedding_model(model_name)
-    except Exception:
+    # Deduplicate before embedding so an article carried by several feeds is
+    # only encoded and scored once.
+    unique_articles = _dedupe_by_link(articles)
+    if not unique_articles:
+        logger.info("No articles with a link to filter.")
+        return []
+    article_texts = [f"{article.get('title', '')}. {article.get('summary', '')}" for article in unique_articles]
+    logger.info("Generating embeddings for %s articles using '%s'...", len(article_texts), model_name)
+
+    # Generate embeddings in batches for efficiency, especially with many articles.
+    article_embeddings = _embed_articles(article_texts, config.ai_settings, embedding_cache_path)
+    if article_embeddings is None:
         return articles
+    logger.info("Embeddings generated successfully.")
 
-    article_texts = [f"{article.get('title', '')}. {article.get('summary', '')}" for article in articles]
-    logging.info(f"Generating embeddings for {len(article_texts)} articles using '{model_name}'...")
-
-    # Generate embeddings in batches for efficiency, especially with many articles
-    article_embeddings = model.encode(article_texts, convert_to_tensor=True, show_progress_bar=False)
-    logging.info("Embeddings generated successfully.")
-
-    # Compute cosine similarity between the project and all articles.
-    cosine_scores = util.cos_sim(project_embedding, article_embeddings)[0]
-
-    relevant_articles: List[Article] = []
-    logging.info(f"Filtering with a similarity threshold of {similarity_threshold:.2f}...")
-    for i, article in enumerate(articles):
-        score = cosine_scores[i].item()
-        if score >= similarity_threshold:
-            logging.info(f"-> PASS: Article '{article['title']}' is semantically relevant (Score: {score:.2f})")
-            article['relevance_score'] = score  # Add score for potential downstream use
-            relevant_articles.append(article)
-        else:
-            logging.debug(f"-> FAIL: Article '{article['title']}' is not relevant (Score: {score:.2f})")
-
-    # Deduplicate the list of articles based on their URL link, keeping the one that appeared first.
-    # This is important if the same article is found in multiple RSS feeds.
-    unique_articles_map: Dict[str, Article] = {}
-    for article in relevant_articles:
-        link = article.get('link')
-        if link and link not in unique_articles_map:
-            unique_articles_map[link] = article
+    # Compute cosine similarity between the project and all articles with one
+    # matrix-vector product, and apply the threshold as a single mask.
+    project_vector = np.asarray(project_embedding, dtype=np.float32).ravel()
+    project_vector = project_vector / (np.linalg.norm(project_vector) or 1.0)
+    cosine_scores = article_embeddings @ project_vector
+    passed = cosine_scores >= similarity_threshold
 
-    final_list = list(unique_articles_map.values())
+    final_list: List[Article] = []
+    logger.info("Filtering with a similarity threshold of %.2f...", similarity_threshold)
+    # Only passing articles are visited, unless the rejections will actually be logged.
+    log_passes = logger.isEnabledFor(logging.INFO)
+    for index in np.flatnonzero(passed).tolist():
+        article, score = unique_articles[index], float(cosine_scores[index])
+        if log_passes:
+            logger.info("-> PASS: Article '%s' is semantically relevant (Score: %.2f)", article['title'], score)
+        article['relevance_score'] = score  # Add score for potential downstream use
+        final_list.append(article)
+    if logger.isEnabledFor(logging.DEBUG):
+        for index in np.flatnonzero(~passed).tolist():
+            article, score = unique_articles[index], float(cosine_scores[index])
+            logger.debug("-> FAIL: Article '%s' is not relevant (Score: %.2f)", article['title'], score)
 
-    logging.info(
-        f"Vigilum finished. Kept {len(final_list)} of {len(articles)} articles after filtering and deduplication.")
+    logger.info(
+        "Vigilum finished. Kept %s of %s articles after filtering and deduplication.", len(final_list), len(articles))
     return final_list
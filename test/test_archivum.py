@@ -1,10 +1,22 @@
 import unittest
 import sqlite3
+import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 # Import the functions to be tested
-from src.legatus_ai.archivum import add_articles_to_archive, filter_new_articles, initialize_database
+from src.legatus_ai.archivum import (
+    INSERT_BATCH_SIZE,
+    NEW_LINKS_QUERY,
+    SCHEMA_VERSION,
+    _insert_batches,
+    _to_archive_row,
+    add_articles_to_archive,
+    close_db_connections,
+    filter_new_articles,
+    get_db_connection,
+    initialize_database,
+)
 
 # Define a mock path for the database. The value doesn't matter as it will be mocked.
 MOCK_DB_PATH = Path("/mock/db.sqlite")
@@ -29,7 +41,6 @@ class TestArchivum(unittest.TestCase):
         Tests that articles can be added and the filtering logic correctly
         identifies new vs. existing articles.
         """
-        print("\nTesting Archivum add and filter logic...")
 
         # --- ARRANGE ---
         # 1. Configure the mock to return our real, in-memory connection.
@@ -73,5 +84,170 @@ class TestArchivum(unittest.TestCase):
         self.assertEqual(mock_get_connection.call_count, 3)
 
 
+class TestArchivumFileDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "data" / "archive.db"
+
+    def tearDown(self):
+        close_db_connections()
+        self.tmp_dir.cleanup()
+
+    def test_connection_is_shared_between_calls(self):
+        """The same connection should be returned for the same database path."""
+
+        initialize_database(self.db_path)
+        add_articles_to_archive(self.db_path, [
+            {'link': 'http://a.com', 'title': 'Article A', 'analysis': {'criticality_score': 4}}
+        ])
+
+        first = get_db_connection(self.db_path)
+        second = get_db_connection(self.db_path)
+        self.assertIs(first, second)
+
+        new_articles = filter_new_articles(self.db_path, [{'link': 'http://a.com'}, {'link': 'http://b.com'}])
+        self.assertEqual([a['link'] for a in new_articles], ['http://b.com'])
+
+    def test_connection_pragmas_are_applied(self):
+        """The shared connection should run in WAL mode with relaxed syncing and mmap reads."""
+
+        conn = get_db_connection(self.db_path)
+
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -64000)
+
+    def test_add_articles_in_multiple_batches(self):
+        """Inputs larger than one INSERT batch should be archived completely, ignoring duplicates."""
+
+        initialize_database(self.db_path)
+        analyses = [
+            {'link': f'http://{i}.com', 'title': f'Article {i}', 'analysis': {'criticality_score': i % 5}}
+            for i in range(INSERT_BATCH_SIZE * 2 + 7)
+        ]
+        add_articles_to_archive(self.db_path, analyses)
+        add_articles_to_archive(self.db_path, analyses[:10])
+
+        count = get_db_connection(self.db_path).execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        self.assertEqual(count, len(analyses))
+
+    def test_filter_handles_more_links_than_sql_variables(self):
+        """The lookup must not depend on binding one parameter per candidate link."""
+
+        initialize_database(self.db_path)
+        add_articles_to_archive(self.db_path, [{'link': 'http://0.com', 'title': 'Article 0', 'analysis': {}}])
+
+        candidates = [{'link': f'http://{i}.com'} for i in range(5000)]
+        new_articles = filter_new_articles(self.db_path, candidates)
+        self.assertEqual(len(new_articles), 4999)
+        self.assertEqual(new_articles[0]['link'], 'http://1.com')
+
+        # Repeated calls reuse the scratch table without leaking previous candidates.
+        self.assertEqual(filter_new_articles(self.db_path, candidates[:2]), [candidates[1]])
+
+    def test_new_links_query_uses_primary_key_lookup(self):
+        """The anti-join must probe the archive by key rather than scan it."""
+
+        initialize_database(self.db_path)
+        filter_new_articles(self.db_path, [{'link': 'http://a.com'}])
+
+        plan = get_db_connection(self.db_path).execute(f"EXPLAIN QUERY PLAN {NEW_LINKS_QUERY}").fetchall()
+        plan_details = " | ".join(row[-1] for row in plan)
+        self.assertNotIn("SCAN a", plan_details)
+        self.assertIn("SEARCH a USING PRIMARY KEY", plan_details)
+
+    def test_close_db_connections_forgets_cached_connection(self):
+        """After closing, a fresh connection should be opened on the next call."""
+
+        first = get_db_connection(self.db_path)
+        close_db_connections()
+        second = get_db_connection(self.db_path)
+
+        self.assertIsNot(first, second)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+
+
+class TestArchivumInsertBatches(unittest.TestCase):
+
+    def test_archive_rows_normalize_criticality_score(self):
+        """Scores should be stored as integers, or NULL when missing or unparseable."""
+        self.assertEqual(_to_archive_row({'link': 'l', 'title': 't', 'analysis': {'criticality_score': 4}}),
+                         ('l', 't', 4))
+        self.assertEqual(_to_archive_row({'link': 'l', 'title': 't', 'analysis': {'criticality_score': '3'}}),
+                         ('l', 't', 3))
+        self.assertEqual(_to_archive_row({'link': 'l', 'title': 't', 'analysis': {'criticality_score': 'high'}}),
+                         ('l', 't', None))
+        self.assertEqual(_to_archive_row({'link': 'l', 'title': 't', 'analysis': None}), ('l', 't', None))
+        self.assertEqual(_to_archive_row({'link': 'l', 'title': 't'}), ('l', 't', None))
+
+    def test_batches_cover_all_rows_with_few_distinct_sizes(self):
+        """Remainders are split into power-of-two batches so INSERT statements repeat."""
+        rows = [(i,) for i in range(INSERT_BATCH_SIZE + 13)]
+
+        batches = list(_insert_batches(rows))
+
+        self.assertEqual([len(b) for b in batches], [INSERT_BATCH_SIZE, 8, 4, 1])
+        self.assertEqual([row for batch in batches for row in batch], rows)
+        self.assertEqual(list(_insert_batches([])), [])
+
+
+class TestArchivumSchemaMigration(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "archive.db"
+
+    def tearDown(self):
+        close_db_connections()
+        self.tmp_dir.cleanup()
+
+    def test_legacy_rowid_table_is_migrated(self):
+        """An archive created with the old rowid schema should be rebuilt without losing rows."""
+
+        # --- ARRANGE ---
+        legacy = sqlite3.connect(self.db_path)
+        legacy.execute(
+            "CREATE TABLE articles (link TEXT PRIMARY KEY, title TEXT NOT NULL, "
+            "criticality_score INTEGER, reported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        legacy.execute("INSERT INTO articles (link, title, criticality_score) VALUES ('http://a.com', 'A', 2)")
+        legacy.commit()
+        legacy.close()
+
+        # --- ACT ---
+        initialize_database(self.db_path)
+        initialize_database(self.db_path)  # A second run must be a no-op.
+
+        # --- ASSERT ---
+        conn = get_db_connection(self.db_path)
+        table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'articles'").fetchone()[0]
+        self.assertIn("WITHOUT ROWID", table_sql.upper())
+        self.assertEqual(
+            conn.execute("SELECT link, title, criticality_score FROM articles").fetchall(),
+            [('http://a.com', 'A', 2)]
+        )
+
+    def test_current_schema_skips_ddl(self):
+        """Once user_version is current, initialization should not run any DDL."""
+
+        # --- ARRANGE ---
+        initialize_database(self.db_path)
+        conn = get_db_connection(self.db_path)
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        # --- ACT ---
+        initialize_database(self.db_path)
+
+        # --- ASSERT ---
+        conn.set_trace_callback(None)
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,8 @@
+import os
+import tempfile
 import unittest
 import textwrap
 from pathlib import Path
-from unittest.mock import patch, mock_open
 
 from pydantic import ValidationError
 
@@ -93,12 +94,22 @@ FULL_YAML = textwrap.dedent("""\
 """)
 
 
+class _TempConfigFileMixin:
+    """Writes YAML into a temporary config.yaml that is removed after the test."""
+
+    def _write_config(self, text: str) -> Path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        config_path = Path(tmp_dir.name) / "config.yaml"
+        config_path.write_text(text, encoding="utf-8")
+        return config_path
+
+
 class TestAppConfigDefaults(unittest.TestCase):
     """Ensure every field falls back to the correct default when YAML is empty."""
 
     def test_empty_dict_produces_all_defaults(self):
         """An empty YAML file (parsed as {}) should still yield a valid config."""
-        print("\nTesting AppConfig with empty dict...")
         cfg = AppConfig.model_validate({})
 
         self.assertFalse(cfg.debug)
@@ -120,29 +131,24 @@ class TestAppConfigDefaults(unittest.TestCase):
 
     def test_default_agent_temperatures(self):
         """Legatus defaults to 0.2; Inquisitor defaults to 0.0."""
-        print("\nTesting default agent temperatures...")
         cfg = AppConfig.model_validate({})
         self.assertAlmostEqual(cfg.ai_settings.legatus_agent.temperature, 0.2)
         self.assertAlmostEqual(cfg.ai_settings.inquisitor_agent.temperature, 0.0)
 
     def test_default_provider_values(self):
         """Provider sub-models should have the expected defaults."""
-        print("\nTesting default provider values...")
         cfg = AppConfig.model_validate({})
         self.assertEqual(cfg.ai_settings.providers.google.model, "gemini-2.5-flash")
         self.assertIsNone(cfg.ai_settings.providers.google.project_id)
         self.assertIsNone(cfg.ai_settings.providers.ollama.base_url)
 
 
-class TestAppConfigFullParse(unittest.TestCase):
+class TestAppConfigFullParse(_TempConfigFileMixin, unittest.TestCase):
     """Verify that a fully-populated YAML is parsed into the correct typed structure."""
 
-    @patch("builtins.open", mock_open(read_data=FULL_YAML))
-    @patch("src.legatus_ai.config.Path.is_file", return_value=True)
-    def test_from_yaml_parses_all_sections(self, _mock_is_file):
+    def test_from_yaml_parses_all_sections(self):
         """from_yaml should populate every nested field correctly."""
-        print("\nTesting from_yaml with full config...")
-        cfg = AppConfig.from_yaml(Path("/mock/config.yaml"))
+        cfg = AppConfig.from_yaml(self._write_config(FULL_YAML))
 
         # Root
         self.assertTrue(cfg.debug)
@@ -186,7 +192,6 @@ class TestAppConfigPartialYaml(unittest.TestCase):
 
     def test_partial_config_fills_defaults(self):
         """Only override what is specified; the rest should be default."""
-        print("\nTesting partial config...")
         cfg = AppConfig.model_validate({
             "debug": True,
             "analysis_rules": {"lookback_period_hours": 168},
@@ -204,7 +209,6 @@ class TestAppConfigPartialYaml(unittest.TestCase):
 
     def test_extra_keys_are_ignored(self):
         """Unknown YAML keys should not cause validation errors."""
-        print("\nTesting extra keys are ignored...")
         cfg = AppConfig.model_validate({
             "unknown_future_key": "hello",
             "debug": True,
@@ -212,54 +216,69 @@ class TestAppConfigPartialYaml(unittest.TestCase):
         self.assertTrue(cfg.debug)
 
 
-class TestAppConfigFromYamlErrors(unittest.TestCase):
+class TestAppConfigFromYamlErrors(_TempConfigFileMixin, unittest.TestCase):
     """Test error paths: missing file, bad YAML, and invalid types."""
 
     def test_missing_file_raises_config_error(self):
         """from_yaml should raise ConfigError when the file does not exist."""
-        print("\nTesting ConfigError for missing file...")
         with self.assertRaises(ConfigError) as ctx:
             AppConfig.from_yaml(Path("/does/not/exist/config.yaml"))
         self.assertIn("not found", str(ctx.exception))
 
-    @patch("builtins.open", mock_open(read_data=": bad: yaml: [[["))
-    @patch("src.legatus_ai.config.Path.is_file", return_value=True)
-    def test_malformed_yaml_raises_config_error(self, _mock_is_file):
+    def test_malformed_yaml_raises_config_error(self):
         """from_yaml should raise ConfigError for unparseable YAML."""
-        print("\nTesting ConfigError for malformed YAML...")
         with self.assertRaises(ConfigError) as ctx:
-            AppConfig.from_yaml(Path("/mock/config.yaml"))
+            AppConfig.from_yaml(self._write_config(": bad: yaml: [[["))
         self.assertIn("YAML parsing error", str(ctx.exception))
 
-    @patch("builtins.open", mock_open(read_data="debug: 'not_a_bool_but_coerced'\n"))
-    @patch("src.legatus_ai.config.Path.is_file", return_value=True)
-    def test_wrong_type_for_nested_int_raises_validation_error(self, _mock_is_file):
+    def test_wrong_type_for_nested_int_raises_validation_error(self):
         """Pydantic should reject a string where an int is expected."""
-        print("\nTesting ValidationError for wrong nested type...")
         yaml_with_bad_type = textwrap.dedent("""\
             analysis_rules:
               lookback_period_hours: "not_a_number"
         """)
-        with patch("builtins.open", mock_open(read_data=yaml_with_bad_type)):
-            with self.assertRaises(ValidationError):
-                AppConfig.from_yaml(Path("/mock/config.yaml"))
+        with self.assertRaises(ValidationError):
+            AppConfig.from_yaml(self._write_config(yaml_with_bad_type))
 
-    @patch("builtins.open", mock_open(read_data=""))
-    @patch("src.legatus_ai.config.Path.is_file", return_value=True)
-    def test_empty_file_produces_defaults(self, _mock_is_file):
+    def test_empty_file_produces_defaults(self):
         """An empty YAML file (safe_load returns None) should yield all defaults."""
-        print("\nTesting empty YAML file...")
-        cfg = AppConfig.from_yaml(Path("/mock/config.yaml"))
+        cfg = AppConfig.from_yaml(self._write_config(""))
         self.assertFalse(cfg.debug)
         self.assertEqual(cfg.scout_settings.timeout, DEFAULT_SCOUT_TIMEOUT)
 
 
+class TestAppConfigFromYamlCache(_TempConfigFileMixin, unittest.TestCase):
+    """Repeated loads of the same file should only parse it when it changes."""
+
+    def test_unchanged_file_returns_cached_instance(self):
+        """Loading an unmodified file twice should return the same parsed object."""
+        config_path = self._write_config("debug: true\n")
+
+        first = AppConfig.from_yaml(config_path)
+        second = AppConfig.from_yaml(config_path)
+
+        self.assertIs(first, second)
+        self.assertTrue(second.debug)
+
+    def test_modified_file_is_parsed_again(self):
+        """A new modification time should invalidate the cached configuration."""
+        config_path = self._write_config("debug: true\n")
+        first = AppConfig.from_yaml(config_path)
+
+        config_path.write_text("debug: false\n", encoding="utf-8")
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = AppConfig.from_yaml(config_path)
+
+        self.assertIsNot(first, second)
+        self.assertFalse(second.debug)
+
+
 class TestAppConfigFromExampleFile(unittest.TestCase):
     """Load the real config.yaml.example and verify it parses without errors."""
 
     def test_example_config_parses_successfully(self):
         """The shipped config.yaml.example should be valid and parseable."""
-        print("\nTesting config.yaml.example parses...")
         example_path = Path(__file__).resolve().parent.parent / "config.yaml.example"
         if not example_path.is_file():
             self.skipTest(f"config.yaml.example not found at {example_path}")
@@ -280,7 +299,6 @@ class TestSubModelsDirect(unittest.TestCase):
 
     def test_agent_config_defaults(self):
         """AgentConfig should have sensible standalone defaults."""
-        print("\nTesting AgentConfig defaults...")
         ac = AgentConfig()
         self.assertEqual(ac.provider, "ollama")
         self.assertEqual(ac.model, "llama3.1")
@@ -288,14 +306,12 @@ class TestSubModelsDirect(unittest.TestCase):
 
     def test_scout_settings_override(self):
         """ScoutSettings should accept overrides."""
-        print("\nTesting ScoutSettings override...")
         ss = ScoutSettings(user_agent="CustomAgent/2.0", timeout=60)
         self.assertEqual(ss.user_agent, "CustomAgent/2.0")
         self.assertEqual(ss.timeout, 60)
 
     def test_speculator_settings_defaults(self):
         """SpeculatorSettings should use constants as defaults."""
-        print("\nTesting SpeculatorSettings defaults...")
         sp = SpeculatorSettings()
         self.assertEqual(sp.user_agent, DEFAULT_SPECULATOR_USER_AGENT)
         self.assertEqual(sp.timeout, DEFAULT_SPECULATOR_TIMEOUT)
@@ -303,13 +319,11 @@ class TestSubModelsDirect(unittest.TestCase):
 
     def test_security_settings_empty_list(self):
         """SecuritySettings should default to an empty skip list."""
-        print("\nTesting SecuritySettings defaults...")
         sec = SecuritySettings()
         self.assertEqual(sec.skip_ssl_verify, [])
 
     def test_data_sources_model_dump(self):
         """DataSources.model_dump() should return a plain dict for iteration."""
-        print("\nTesting DataSources model_dump...")
         ds = DataSources(rss_feeds=["https://a.com/feed"], github_releases=["owner/repo"])
         dumped = ds.model_dump()
         self.assertIsInstance(dumped, dict)
@@ -318,5 +332,25 @@ class TestSubModelsDirect(unittest.TestCase):
         self.assertEqual(dumped["rss_feeds"], ["https://a.com/feed"])
 
 
+class TestAppConfigImmutability(unittest.TestCase):
+    """The parsed configuration is shared by every module and must stay read-only."""
+
+    def test_assignment_is_rejected_on_every_level(self):
+        """Both the root model and nested sections should refuse attribute assignment."""
+        cfg = AppConfig.model_validate({})
+
+        with self.assertRaises(ValidationError):
+            cfg.debug = True
+        with self.assertRaises(ValidationError):
+            cfg.speculator_settings.concurrency_limit = 50
+        self.assertEqual(cfg.speculator_settings.concurrency_limit, DEFAULT_CONCURRENCY_LIMIT)
+
+    def test_extra_keys_are_ignored_in_nested_sections(self):
+        """Unknown keys inside a section should be dropped, not stored on the model."""
+        cfg = AppConfig.model_validate({"scout_settings": {"timeout": 5, "retries": 3}})
+        self.assertEqual(cfg.scout_settings.timeout, 5)
+        self.assertNotIn("retries", cfg.scout_settings.model_dump())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,36 +1,41 @@
 import unittest
+import tempfile
+import textwrap
 import numpy as np
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 # Import the function to be tested
-from src.legatus_ai.context_generator import generate_full_context
+from src.legatus_ai.context_generator import embed_project_context, generate_full_context, _parse_version_catalog
 from src.legatus_ai.constants import DEFAULT_EMBEDDING_MODEL
 
 # Import AppConfig to build typed mock configs
 from src.legatus_ai.config import AppConfig
 
 
+def _fake_encode(texts, **kwargs):
+    """Stands in for SentenceTransformer.encode: one orthogonal unit vector per input text."""
+    return np.eye(3, dtype=np.float32)[:len(texts)]
+
+
 class TestContextGenerator(unittest.TestCase):
 
     # Patch the functions where they are *used* (in the context_generator module)
-    @patch('src.legatus_ai.context_generator.SentenceTransformer')
+    @patch('src.legatus_ai.context_generator.get_embedding_model')
     @patch('src.legatus_ai.context_generator._parse_version_catalog')
-    def test_generate_full_context_with_catalog(self, mock_parse_vc, mock_sentence_transformer):
+    def test_generate_full_context_with_catalog(self, mock_parse_vc, mock_get_model):
         """
         Tests that the main context generator correctly assembles data
         from the config and the version catalog parser when it is enabled.
         """
-        print("\nTesting full context generation (with version catalog)...")
 
         # --- ARRANGE ---
         # 1. Define mock outputs for the patched functions.
         mock_parse_vc.return_value = {"retrofit:2.9.0", "compose-ui:1.6.0"}
 
         mock_model_instance = MagicMock()
-        dummy_embedding = np.array([0.1, 0.2, 0.3])
-        mock_model_instance.encode.return_value = dummy_embedding
-        mock_sentence_transformer.return_value = mock_model_instance
+        mock_model_instance.encode.side_effect = _fake_encode
+        mock_get_model.return_value = mock_model_instance
 
         # 2. Create a typed config.
         mock_config = AppConfig.model_validate({
@@ -70,24 +75,31 @@ class TestContextGenerator(unittest.TestCase):
         self.assertIn("compose-ui:1.6.0", final_deps)  # From mocked parser
         self.assertIn("gradle", final_deps)  # From manual keywords
 
-        # Verify the embedding model was initialized and used correctly.
-        mock_sentence_transformer.assert_called_once_with("mock-embedding-model")
+        # Verify the cached embedding model was requested and used correctly.
+        mock_get_model.assert_called_once_with(mock_config)
+        # The narrative and the dependency list are encoded as separate segments in one call.
         mock_model_instance.encode.assert_called_once()
+        narrative_text, dependencies_text = mock_model_instance.encode.call_args.args[0]
+        self.assertIn("This is a test project.", narrative_text)
+        self.assertTrue(dependencies_text.endswith("compose-ui:1.6.0 gradle retrofit:2.9.0"))
+
+        # The segment embeddings are combined into a single unit vector.
         self.assertIn('embedding', result_context)
-        self.assertTrue(np.array_equal(result_context['embedding'], dummy_embedding))
+        expected_embedding = np.array([1.0, 1.0, 0.0]) / np.sqrt(2)
+        self.assertTrue(np.allclose(result_context['embedding'], expected_embedding))
+        self.assertEqual(result_context['embedding'].dtype, np.float32)
 
-    @patch('src.legatus_ai.context_generator.SentenceTransformer')
+    @patch('src.legatus_ai.context_generator.get_embedding_model')
     @patch('src.legatus_ai.context_generator._parse_version_catalog')
-    def test_generate_full_context_without_catalog(self, mock_parse_vc, mock_sentence_transformer):
+    def test_generate_full_context_without_catalog(self, mock_parse_vc, mock_get_model):
         """
         Tests that the version catalog parser is NOT called if the catalog_path is None.
         """
-        print("\nTesting full context generation (without version catalog)...")
 
         # --- ARRANGE ---
         mock_model_instance = MagicMock()
-        mock_model_instance.encode.return_value = np.array([0.1, 0.2, 0.3])
-        mock_sentence_transformer.return_value = mock_model_instance
+        mock_model_instance.encode.side_effect = _fake_encode
+        mock_get_model.return_value = mock_model_instance
 
         # Config where version catalog is enabled, but we will pass a None path
         mock_config = AppConfig.model_validate({
@@ -112,7 +124,124 @@ class TestContextGenerator(unittest.TestCase):
         self.assertEqual(result_context['dependencies'], {"gradle"})
 
         # Verify the default embedding model was used.
-        mock_sentence_transformer.assert_called_once_with(DEFAULT_EMBEDDING_MODEL)
+        mock_get_model.assert_called_once_with(mock_config)
+        self.assertEqual(mock_config.ai_settings.embedding_model, DEFAULT_EMBEDDING_MODEL)
+
+    @patch('src.legatus_ai.context_generator.get_embedding_model')
+    def test_embedding_can_be_deferred(self, mock_get_model):
+        """Tests that the context can be built without its embedding, which is then computed on demand."""
+
+        # --- ARRANGE ---
+        mock_get_model.return_value.encode.side_effect = _fake_encode
+        config = AppConfig.model_validate({"project_info": {"context": "A simple project."}})
+
+        # --- ACT ---
+        context = generate_full_context(config, None, include_embedding=False)
+
+        # --- ASSERT ---
+        self.assertNotIn('embedding', context)
+        mock_get_model.assert_not_called()
+
+        embedding = embed_project_context(config, context)
+        self.assertTrue(np.allclose(embedding, [1.0, 0.0, 0.0]))
+
+    @patch('src.legatus_ai.context_generator.get_embedding_model')
+    def test_context_embedding_is_reused_from_disk_cache(self, mock_get_model):
+        """Unchanged context segments should be loaded from the cache file instead of re-encoded."""
+
+        # --- ARRANGE ---
+        mock_model_instance = MagicMock()
+        mock_model_instance.encode.side_effect = _fake_encode
+        mock_get_model.return_value = mock_model_instance
+
+        dependency_sources = {"manual_keywords": ["gradle"]}
+        config = AppConfig.model_validate({
+            "project_info": {"context": "A cached project.", "dependency_sources": dependency_sources}
+        })
+        changed_config = AppConfig.model_validate({
+            "project_info": {"context": "A changed project.", "dependency_sources": dependency_sources}
+        })
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = Path(tmp_dir) / "data" / "context_embedding.npz"
+
+            # --- ACT ---
+            first = generate_full_context(config, None, cache_path)
+            second = generate_full_context(config, None, cache_path)
+
+            # --- ASSERT ---
+            self.assertTrue(cache_path.is_file())
+            mock_model_instance.encode.assert_called_once()
+            self.assertTrue(np.array_equal(first['embedding'], second['embedding']))
+
+            # A changed narrative re-encodes only that segment; the dependencies are reused.
+            generate_full_context(changed_config, None, cache_path)
+            self.assertEqual(mock_model_instance.encode.call_count, 2)
+            reencoded = mock_model_instance.encode.call_args.args[0]
+            self.assertEqual(len(reencoded), 1)
+            self.assertIn("A changed project.", reencoded[0])
+
+    @patch('src.legatus_ai.context_generator.get_embedding_model')
+    def test_truncated_embedding_cache_is_recomputed(self, mock_get_model):
+        """A cache file cut short mid-stream should be ignored and the context re-encoded."""
+
+        # --- ARRANGE ---
+        mock_model_instance = MagicMock()
+        mock_model_instance.encode.side_effect = _fake_encode
+        mock_get_model.return_value = mock_model_instance
+        config = AppConfig.model_validate({"project_info": {"context": "A cached project."}})
+        truncated = EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = Path(tmp_dir) / "context_embedding.npz"
+
+            # --- ACT ---
+            with patch('src.legatus_ai.context_generator.np.load', side_effect=truncated):
+                context = generate_full_context(config, None, cache_path)
+
+        # --- ASSERT ---
+        mock_model_instance.encode.assert_called_once()
+        self.assertEqual(context['embedding'].dtype, np.float32)
+
+
+class TestParseVersionCatalog(unittest.TestCase):
+
+    def test_parses_every_library_notation(self):
+        """name/module/compact notations and direct/referenced versions should all be extracted."""
+
+        catalog = textwrap.dedent("""\
+            [versions]
+            retrofit = "2.9.0"
+
+            [libraries]
+            retrofit = { module = "com.squareup.retrofit2:retrofit", version.ref = "retrofit" }
+            hilt = { group = "com.google.dagger", name = "hilt-android", version = "2.51" }
+            compose-bom = { module = "androidx.compose:compose-bom" }
+            okhttp = "com.squareup.okhttp3:okhttp:4.12.0"
+            compose-gradlePlugin = { id = "org.jetbrains.compose" }
+        """)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog_path = Path(tmp_dir) / "libs.versions.toml"
+            catalog_path.write_text(catalog, encoding="utf-8")
+
+            with self.assertNoLogs(level="WARNING"):
+                dependencies = _parse_version_catalog(catalog_path)
+
+        self.assertEqual(dependencies, {"retrofit:2.9.0", "hilt-android:2.51", "compose-bom", "okhttp:4.12.0"})
+
+    def test_malformed_file_returns_empty_set(self):
+        """Invalid TOML should be logged and skipped."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog_path = Path(tmp_dir) / "libs.versions.toml"
+            catalog_path.write_text("[libraries\nbroken = ", encoding="utf-8")
+
+            with self.assertLogs(level="WARNING") as logs:
+                self.assertEqual(_parse_version_catalog(catalog_path), set())
+        self.assertIn("Could not parse TOML file", logs.output[0])
+
+    def test_missing_file_returns_empty_set(self):
+        """A missing catalog should be skipped, not raise."""
+        self.assertEqual(_parse_version_catalog(Path("/does/not/exist/libs.versions.toml")), set())
 
 
 if __name__ == '__main__':
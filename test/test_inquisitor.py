@@ -1,9 +1,19 @@
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
 
 # Import the function to be tested
-from src.legatus_ai.inquisitor import inquisitor_main
+from src.legatus_ai.inquisitor import (
+    MAX_CHAT_HISTORY_MESSAGES,
+    _load_prompt_template,
+    inquisitor_main,
+    interactive_loop,
+)
 
 # Import AppConfig to build typed mock configs
 from src.legatus_ai.config import AppConfig
@@ -28,7 +38,6 @@ class TestInquisitor(unittest.TestCase):
         """
         Tests the main orchestration and setup of the Inquisitor agent.
         """
-        print("\nTesting Inquisitor main orchestration...")
 
         # --- ARRANGE ---
         # 1. Mock the return values for the setup functions
@@ -45,10 +54,11 @@ class TestInquisitor(unittest.TestCase):
         mock_config = AppConfig.model_validate({"debug": True})
         mock_from_yaml.return_value = mock_config
 
-        mock_llm = MagicMock(name="MockLLM")
+        # Only passed along and compared by identity, so plain sentinels suffice.
+        mock_llm = object()
         mock_init_llm.return_value = mock_llm
 
-        mock_agent_executor = MagicMock(name="MockAgentExecutor")
+        mock_agent_executor = object()
         mock_assemble_agent.return_value = mock_agent_executor
 
         # --- ACT ---
@@ -65,19 +75,14 @@ class TestInquisitor(unittest.TestCase):
         # 2. Verify that the main interactive loop was started with the fully assembled agent
         mock_interactive_loop.assert_called_once()
         # Check that the first argument passed to the loop was our agent executor
-        self.assertEqual(mock_interactive_loop.call_args.args[0], mock_agent_executor)
+        self.assertIs(mock_interactive_loop.call_args.args[0], mock_agent_executor)
 
     @patch('src.legatus_ai.inquisitor.resolve_paths')
     @patch('src.legatus_ai.config.AppConfig.from_yaml')
-    @patch('src.legatus_ai.inquisitor.logging')
-    @patch('src.legatus_ai.inquisitor.Console')
-    def test_inquisitor_setup_failure(
-            self, mock_console, mock_logging, mock_from_yaml, mock_resolve_paths
-    ):
+    def test_inquisitor_setup_failure(self, mock_from_yaml, mock_resolve_paths):
         """
         Tests that a critical error is logged and printed if setup fails.
         """
-        print("\nTesting Inquisitor setup failure handling...")
 
         # --- ARRANGE ---
         # Simulate a failure during config loading
@@ -91,15 +96,85 @@ class TestInquisitor(unittest.TestCase):
         mock_resolve_paths.return_value = mock_paths
 
         # --- ACT ---
-        inquisitor_main()
+        console_output = io.StringIO()
+        with self.assertLogs(level="CRITICAL") as logs, contextlib.redirect_stdout(console_output):
+            inquisitor_main()
 
         # --- ASSERT ---
         # Verify that a critical error was logged
-        mock_logging.critical.assert_called()
+        self.assertIn(error_message, logs.output[0])
         # Verify that a fatal error message was printed to the console for the user
-        mock_console.return_value.print.assert_called()
-        # Check that the error message contains the word "FATAL"
-        self.assertIn("FATAL", mock_console.return_value.print.call_args.args[0])
+        self.assertIn("FATAL", console_output.getvalue())
+        self.assertIn(error_message, console_output.getvalue())
+
+
+class TestInquisitorInteractiveLoop(unittest.TestCase):
+
+    def test_chat_history_is_capped(self):
+        """The history passed to the agent should never exceed the configured message cap."""
+
+        # --- ARRANGE ---
+        turns = MAX_CHAT_HISTORY_MESSAGES  # Twice as many messages as the cap allows.
+        mock_console = MagicMock()
+        mock_console.input.side_effect = [f"question {i}" for i in range(turns)] + ["exit"]
+
+        history_sizes = []
+        first_questions = []
+
+        async def fake_ainvoke(inputs):
+            history = inputs["chat_history"]
+            history_sizes.append(len(history))
+            first_questions.append(history[0].content if history else None)
+            return {"output": f"answer to {inputs['input']}"}
+
+        mock_agent_executor = MagicMock()
+        mock_agent_executor.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+
+        # --- ACT ---
+        asyncio.run(interactive_loop(mock_agent_executor, mock_console))
+
+        # --- ASSERT ---
+        self.assertEqual(mock_agent_executor.ainvoke.call_count, turns)
+        self.assertEqual(max(history_sizes), MAX_CHAT_HISTORY_MESSAGES)
+        self.assertEqual(history_sizes[-1], MAX_CHAT_HISTORY_MESSAGES)
+        # Once full, the oldest pair is dropped first.
+        self.assertEqual(first_questions[-1], f"question {turns - 1 - MAX_CHAT_HISTORY_MESSAGES // 2}")
+
+
+class TestInquisitorPromptCache(unittest.TestCase):
+
+    def setUp(self):
+        _load_prompt_template.cache_clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.prompt_path = Path(self.tmp_dir.name) / "prompt_inquisitor.txt"
+        self.prompt_path.write_text("Tools: {tools} ({tool_names})\nQuestion: {input}", encoding="utf-8")
+
+    def tearDown(self):
+        _load_prompt_template.cache_clear()
+        self.tmp_dir.cleanup()
+
+    def _load(self):
+        mtime_ns = self.prompt_path.stat().st_mtime_ns
+        return _load_prompt_template(self.prompt_path, mtime_ns, "sql: query the db", "sql")
+
+    def test_unchanged_prompt_is_compiled_once(self):
+        """Loading the same, unmodified prompt file should return the cached template."""
+        first = self._load()
+        self.assertIs(first, self._load())
+        self.assertEqual(first.input_variables, ["input"])
+        self.assertIn("sql: query the db", first.format(input="q"))
+
+    def test_modified_prompt_is_reloaded(self):
+        """A newer modification time should bypass the cache and pick up the new text."""
+        first = self._load()
+
+        self.prompt_path.write_text("Edited {tools} {tool_names} {input}", encoding="utf-8")
+        stat = self.prompt_path.stat()
+        os.utime(self.prompt_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = self._load()
+        self.assertIsNot(first, second)
+        self.assertIn("Edited", second.format(input="q"))
 
 
 if __name__ == '__main__':
@@ -1,9 +1,12 @@
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import DEFAULT, patch, MagicMock
+
+from langchain_core.runnables import Runnable
 
 # Import the function we are testing
-from src.legatus_ai.legatus import legatus_main
+from src.legatus_ai.legatus import legatus_main, initialize_ai_chain
 
 # Import AppConfig to build typed mock configs
 from src.legatus_ai.config import AppConfig
@@ -12,6 +15,27 @@ from src.legatus_ai.config import AppConfig
 from src.legatus_ai.paths import ApplicationPaths
 
 
+def _run_legatus_main(config: AppConfig, found_articles):
+    """Runs legatus_main with every stage mocked and Scout returning ``found_articles``; returns the mocks by name."""
+    with patch.multiple(
+            'src.legatus_ai.legatus',
+            load_dotenv=DEFAULT, resolve_paths=DEFAULT, initialize_database=DEFAULT, configure_torch_threads=DEFAULT,
+            preload_embedding_model=DEFAULT, generate_full_context=DEFAULT,
+            embed_project_context=DEFAULT, initialize_ai_chain=DEFAULT, load_feed_cache=DEFAULT,
+            save_feed_cache=DEFAULT, run_scout=DEFAULT, filter_articles=DEFAULT, filter_new_articles=DEFAULT,
+            run_speculator=DEFAULT, generate_report=DEFAULT, add_articles_to_archive=DEFAULT,
+            close_db_connections=DEFAULT, close_embedding_cache=DEFAULT
+    ) as mocks, patch('src.legatus_ai.config.AppConfig.from_yaml', return_value=config), \
+            patch('src.legatus_ai.legatus.logging.basicConfig'):
+        mocks['generate_full_context'].return_value = {'dependencies': set()}
+        mocks['load_feed_cache'].return_value = {}
+        mocks['run_scout'].return_value = found_articles
+        mocks['filter_articles'].return_value = []
+        mocks['filter_new_articles'].return_value = []
+        legatus_main()
+    return mocks
+
+
 class TestLegatusOrchestration(unittest.TestCase):
 
     # The patch order is reversed from the argument order.
@@ -21,9 +45,14 @@ class TestLegatusOrchestration(unittest.TestCase):
     @patch('src.legatus_ai.legatus.resolve_paths')
     @patch('src.legatus_ai.config.AppConfig.from_yaml')
     @patch('src.legatus_ai.legatus.initialize_database')
+    @patch('src.legatus_ai.legatus.configure_torch_threads')
+    @patch('src.legatus_ai.legatus.threading.Thread')
     @patch('src.legatus_ai.legatus.generate_full_context')
+    @patch('src.legatus_ai.legatus.embed_project_context')
     @patch('src.legatus_ai.legatus.initialize_ai_chain')
     @patch('src.legatus_ai.legatus.os.getenv')
+    @patch('src.legatus_ai.legatus.load_feed_cache')
+    @patch('src.legatus_ai.legatus.save_feed_cache')
     @patch('src.legatus_ai.legatus.run_scout')
     @patch('src.legatus_ai.legatus.filter_articles')
     @patch('src.legatus_ai.legatus.filter_new_articles')
@@ -32,14 +61,13 @@ class TestLegatusOrchestration(unittest.TestCase):
     @patch('src.legatus_ai.legatus.add_articles_to_archive')
     def test_legatus_full_run_with_new_articles(
             self, mock_add_archive, mock_gen_report, mock_speculator,
-            mock_filter_new, mock_filter_articles, mock_scout, mock_getenv,
-            mock_init_chain, mock_gen_context, mock_init_db, mock_from_yaml,
-            mock_resolve_paths, mock_logging, mock_dotenv
+            mock_filter_new, mock_filter_articles, mock_scout, mock_save_feed_cache, mock_load_feed_cache, mock_getenv,
+            mock_init_chain, mock_embed_context, mock_gen_context, mock_thread, mock_torch_threads, mock_init_db,
+            mock_from_yaml, mock_resolve_paths, mock_logging, mock_dotenv
     ):
         """
         Tests the full orchestration of legatus.py when new articles are found and analyzed.
         """
-        print("\nTesting Legatus orchestration (full run)...")
 
         # --- ARRANGE ---
         # 1. Create a typed config that matches the expected structure.
@@ -66,18 +94,26 @@ class TestLegatusOrchestration(unittest.TestCase):
             legatus_prompt=Path("/mock/app/prompts/legatus.txt"),
             inquisitor_prompt=Path("/mock/app/prompts/inquisitor.txt"),
             report_dir=Path("/mock/app/reports"),
-            version_catalog=Path("/mock/app/project/libs.versions.toml")
+            version_catalog=Path("/mock/app/project/libs.versions.toml"),
+            context_embedding_cache=Path("/mock/app/data/context_embedding.npz"),
+            feed_cache=Path("/mock/app/data/feed_cache.json"),
+            article_embedding_cache=Path("/mock/app/data/article_embeddings.db")
         )
         mock_resolve_paths.return_value = mock_paths
 
         # 3. Mock the return values for each stage of the pipeline
         mock_getenv.return_value = "dummy_github_token"
-        mock_gen_context.return_value = {'dependencies': {'dep1'}, 'embedding': 'mock_embedding'}
+        mock_gen_context.return_value = {'dependencies': {'dep1'}}
+        mock_embed_context.return_value = 'mock_embedding'
         mock_init_chain.return_value = MagicMock()  # A mock runnable chain
+        mock_load_feed_cache.return_value = {'http://feed': {'etag': '"abc"'}}
         mock_scout.return_value = [{'title': 'Article from Scout'}]
         mock_filter_articles.return_value = [{'title': 'Article from Vigil'}]
         mock_filter_new.return_value = [{'title': 'New Article from Archivum'}]
-        mock_speculator.return_value = [{'title': 'Final Analysis'}]
+        mock_speculator.return_value = [
+            {'title': 'Minor Analysis', 'analysis': {'criticality_score': 2}},
+            {'title': 'Critical Analysis', 'analysis': {'criticality_score': 5}},
+        ]
 
         # --- ACT ---
         legatus_main()
@@ -88,27 +124,118 @@ class TestLegatusOrchestration(unittest.TestCase):
         mock_from_yaml.assert_called_once_with(mock_paths.config)
         mock_init_db.assert_called_once_with(mock_paths.database)
 
+        # Verify PyTorch's thread count is set on the main thread, which does the encoding
+        mock_torch_threads.assert_called_once_with()
+
+        # Verify the embedding model is preloaded in the background
+        self.assertEqual(mock_thread.call_args.kwargs['args'], (mock_config,))
+        mock_thread.return_value.start.assert_called_once()
+
         # Verify context and AI chain setup
-        mock_gen_context.assert_called_once_with(mock_config, mock_paths.version_catalog)
+        mock_gen_context.assert_called_once_with(mock_config, mock_paths.version_catalog, include_embedding=False)
         mock_init_chain.assert_called_once()
+        # The prompt context is compact JSON without the embedding
+        context_string = mock_init_chain.call_args.args[1]
+        self.assertEqual(context_string, '{"dependencies":["dep1"]}')
 
         # Verify pipeline stages are called with correct data
-        mock_scout.assert_called_once_with(mock_config, "dummy_github_token")
+        mock_load_feed_cache.assert_called_once_with(mock_paths.feed_cache)
+        mock_scout.assert_called_once_with(mock_config, "dummy_github_token", mock_load_feed_cache.return_value)
+        # Articles were found, so the project embedding was computed for Vigil
+        mock_embed_context.assert_called_once_with(
+            mock_config, mock_gen_context.return_value, mock_paths.context_embedding_cache
+        )
+        self.assertEqual(mock_gen_context.return_value['embedding'], 'mock_embedding')
         mock_filter_articles.assert_called_once_with(
             mock_scout.return_value,
             mock_gen_context.return_value,
-            mock_config
+            mock_config,
+            mock_paths.article_embedding_cache
         )
         mock_filter_new.assert_called_once_with(mock_paths.database, mock_filter_articles.return_value)
         mock_speculator.assert_called_once_with(
             mock_filter_new.return_value,
             mock_init_chain.return_value,
-            mock_config
+            mock_config,
+            set()
         )
 
         # Verify final reporting and archiving stages
         mock_gen_report.assert_called_once_with(mock_config, mock_paths.report_dir, mock_speculator.return_value)
         mock_add_archive.assert_called_once_with(mock_paths.database, mock_speculator.return_value)
+        mock_save_feed_cache.assert_called_once_with(mock_paths.feed_cache, mock_load_feed_cache.return_value)
+
+        # The analyses are sorted once, before reporting, with the most critical first
+        reported = mock_gen_report.call_args.args[2]
+        self.assertEqual([r['title'] for r in reported], ['Critical Analysis', 'Minor Analysis'])
+
+    def test_disabled_vigil_skips_context_embedding(self):
+        """
+        Tests that the project embedding is not computed when Vigil is disabled.
+        """
+        # --- ARRANGE ---
+        config = AppConfig.model_validate({"analysis_rules": {"vigil_disable": True}})
+
+        # --- ACT ---
+        mocks = _run_legatus_main(config, [{'title': 'Article', 'link': 'http://a.com'}])
+
+        # --- ASSERT ---
+        mocks['embed_project_context'].assert_not_called()
+        mocks['preload_embedding_model'].assert_not_called()
+        mocks['filter_articles'].assert_called_once()
+
+    def test_empty_scout_result_skips_the_embedding_model(self):
+        """
+        Tests that a run in which Scout finds nothing never preloads the embedding model.
+        """
+        # --- ACT ---
+        mocks = _run_legatus_main(AppConfig(), [])
+
+        # --- ASSERT ---
+        mocks['preload_embedding_model'].assert_not_called()
+        mocks['embed_project_context'].assert_not_called()
+
+
+class TestLegatusAIChain(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.prompt_path = Path(self.tmp_dir.name) / "prompt_legatus.txt"
+        self.prompt_path.write_text("Title: {title}\n{article_text}", encoding="utf-8")
+
+    def test_ollama_chain_is_built(self):
+        """
+        Tests that the Ollama provider yields a runnable chain with the context in the system prompt.
+        """
+
+        config = AppConfig.model_validate({
+            'ai_settings': {
+                'legatus_agent': {'provider': 'ollama', 'model': 'mock-model'},
+                'providers': {'ollama': {'base_url': 'http://mock-url'}}
+            },
+            'speculator_settings': {'concurrency_limit': 32}
+        })
+
+        chain = initialize_ai_chain(config, '{"narrative": "An Android app"}', self.prompt_path)
+
+        self.assertIsInstance(chain, Runnable)
+        system_message = chain.first.messages[0]
+        self.assertIn("An Android app", system_message.content)
+
+        # The async connection pool is sized to the Speculator's concurrency
+        limits = chain.middle[0].async_client_kwargs["limits"]
+        self.assertEqual(limits.max_keepalive_connections, 32)
+
+    def test_google_without_project_id_returns_none(self):
+        """
+        Tests that the Google provider is rejected before its client is constructed.
+        """
+
+        config = AppConfig.model_validate({'ai_settings': {'legatus_agent': {'provider': 'google'}}})
+
+        with patch('src.legatus_ai.legatus.logging'):
+            self.assertIsNone(initialize_ai_chain(config, "{}", self.prompt_path))
 
 
 if __name__ == '__main__':
@@ -1,11 +1,14 @@
 # In test_notarius.py
 
-import unittest
+import csv
 import json
+import tempfile
+import unittest
 from pathlib import Path
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, mock_open
 
-from src.legatus_ai.notarius import generate_report
+from src.legatus_ai import notarius
+from src.legatus_ai.notarius import generate_report, sort_by_criticality
 
 # Import AppConfig to build typed mock configs
 from src.legatus_ai.config import AppConfig
@@ -19,74 +22,112 @@ class TestNotarius(unittest.TestCase):
             {'title': 'Article A', 'analysis': {'criticality_score': 3}},
         ]
         self.mock_output_dir = Path("/mock/reports")
-
-    # Patch the two filesystem interactions of the main function
-    @patch('src.legatus_ai.notarius.Path.mkdir')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_generate_report_writes_csv(self, mock_file_open, mock_mkdir):
+        # Reports that are actually written go to a directory that does not exist yet.
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.report_dir = Path(tmp_dir.name) / "reports"
+        # Each test starts as a fresh process that has not created any report directory.
+        notarius._created_report_dirs.clear()
+
+    def _single_report(self, suffix: str) -> Path:
+        """Returns the only report written to the report directory, checking its name."""
+        reports = list(self.report_dir.iterdir())
+        self.assertEqual(len(reports), 1)
+        self.assertRegex(reports[0].name, rf'^legatus_report_\d{{8}}T\d{{6}}Z\{suffix}$')
+        return reports[0]
+
+    def test_generate_report_writes_csv(self):
         """
         Tests that generate_report correctly creates a CSV file.
         """
-        print("\nTesting Notarius CSV report generation...")
 
         mock_config = AppConfig.model_validate({"notarius_settings": {"format": "csv"}})
 
-        # Use a with statement to patch the DictWriter for this test
-        with patch("src.legatus_ai.notarius.csv.DictWriter") as mock_csv_writer:
-            mock_writer_instance = MagicMock()
-            mock_csv_writer.return_value = mock_writer_instance
+        # --- ACT ---
+        generate_report(mock_config, self.report_dir, self.mock_analysis_results)
+
+        # --- ASSERT ---
+        # 1. Verify the directory and a single timestamped CSV file were created
+        with open(self._single_report('.csv'), newline='', encoding='utf-8') as csvfile:
+            header, *rows = csv.reader(csvfile)
+
+        # 2. Verify the header row and then all data rows
+        self.assertEqual(header[0], 'Title')
+        self.assertEqual(len(rows), 2)
+
+        # 3. Verify data was written in the order given
+        self.assertEqual(rows[0][0], 'Article B')
+        self.assertEqual(rows[0][2], '5')
+
+        # 4. Every row carries the same report timestamp
+        self.assertEqual(rows[0][-1], rows[1][-1])
+
+    def test_generate_report_writes_json(self):
+        """
+        Tests that generate_report correctly creates a JSON file.
+        """
+
+        mock_config = AppConfig.model_validate({"notarius_settings": {"format": "json"}})
 
-            # --- ACT ---
-            generate_report(mock_config, self.mock_output_dir, self.mock_analysis_results)
+        # --- ACT ---
+        generate_report(mock_config, self.report_dir, self.mock_analysis_results)
 
-            # --- ASSERT ---
-            # 1. Verify the directory was created
-            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        # --- ASSERT ---
+        # Verify the written report contains the data in the order given
+        report = json.loads(self._single_report('.json').read_text(encoding='utf-8'))
+        self.assertEqual(report['article_count'], 2)
+        self.assertEqual(report['analyses'][0]['title'], 'Article B')
 
-            # 2. Verify the file was opened for writing
-            mock_file_open.assert_called_once()
-            opened_filepath = mock_file_open.call_args.args[0]
-            self.assertTrue(opened_filepath.name.endswith('.csv'))
+    @patch('src.legatus_ai.notarius.orjson', None)
+    def test_generate_report_writes_json_without_orjson(self):
+        """
+        Tests that the standard library encoder is used when orjson is not installed.
+        """
 
-            # 3. Verify the CSV writer was used correctly
-            mock_writer_instance.writeheader.assert_called_once()
-            self.assertEqual(mock_writer_instance.writerow.call_count, 2)
+        mock_config = AppConfig.model_validate({"notarius_settings": {"format": "json"}})
+
+        # --- ACT ---
+        generate_report(mock_config, self.report_dir, self.mock_analysis_results)
 
-            # 4. Verify data was sorted correctly before writing
-            first_row_data = mock_writer_instance.writerow.call_args_list[0].args[0]
-            self.assertEqual(first_row_data['Title'], 'Article B')
+        # --- ASSERT ---
+        report = json.loads(self._single_report('.json').read_text(encoding='utf-8'))
+        self.assertEqual(report['analyses'][0]['title'], 'Article B')
 
     @patch('src.legatus_ai.notarius.Path.mkdir')
     @patch('builtins.open', new_callable=mock_open)
-    def test_generate_report_writes_json(self, mock_file_open, mock_mkdir):
+    def test_report_directory_is_created_once(self, mock_file_open, mock_mkdir):
         """
-        Tests that generate_report correctly creates a JSON file.
+        Tests that repeated reports to the same directory only create it once.
         """
-        print("\nTesting Notarius JSON report generation...")
 
         mock_config = AppConfig.model_validate({"notarius_settings": {"format": "json"}})
 
-        with patch("src.legatus_ai.notarius.json.dump") as mock_json_dump:
-            # --- ACT ---
-            generate_report(mock_config, self.mock_output_dir, self.mock_analysis_results)
+        generate_report(mock_config, self.mock_output_dir, self.mock_analysis_results)
+        generate_report(mock_config, self.mock_output_dir, self.mock_analysis_results)
+
+        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        self.assertEqual(mock_file_open.call_count, 2)
+
+    def test_sort_by_criticality_orders_highest_first(self):
+        """
+        Tests that results are sorted in place by score, with unscored results last.
+        """
+
+        results = [
+            {'title': 'Unscored'},
+            {'title': 'Low', 'analysis': {'criticality_score': 1}},
+            {'title': 'High', 'analysis': {'criticality_score': 4}},
+        ]
 
-            # --- ASSERT ---
-            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
-            mock_file_open.assert_called_once()
-            opened_filepath = mock_file_open.call_args.args[0]
-            self.assertTrue(opened_filepath.name.endswith('.json'))
+        sort_by_criticality(results)
 
-            # Verify json.dump was called with sorted data
-            mock_json_dump.assert_called_once()
-            dump_args = mock_json_dump.call_args.args[0]
-            self.assertEqual(dump_args['analyses'][0]['title'], 'Article B')
+        self.assertEqual([r['title'] for r in results], ['High', 'Low', 'Unscored'])
 
     # This test needs no file system patches as it should exit early
     def test_generate_report_handles_empty_results(self):
         """
         Tests that no file operations occur if the analysis results are empty.
         """
-        print("\nTesting Notarius with empty results...")
 
         mock_config = AppConfig.model_validate({"notarius_settings": {"format": "csv"}})
 
@@ -1,6 +1,6 @@
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
 
 # Import the function and dataclass to be tested
 from src.legatus_ai.paths import resolve_paths, ApplicationPaths
@@ -9,19 +9,28 @@ from src.legatus_ai.paths import resolve_paths, ApplicationPaths
 class TestPaths(unittest.TestCase):
 
     def setUp(self):
-        """Define a mock project root for all tests."""
-        self.mock_project_root = Path("/mock/app")
-
-    @patch('src.legatus_ai.paths.Path.is_dir')
-    @patch('src.legatus_ai.paths.Path.is_file')
-    def test_paths_when_user_files_exist(self, mock_is_file, mock_is_dir):
+        """Create an empty project root for each test."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.mock_project_root = Path(self.tmp_dir.name)
+
+    def _touch(self, relative_path: str):
+        """Creates an empty file (and its parent directories) under the project root."""
+        path = self.mock_project_root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    def test_paths_when_user_files_exist(self):
         """
         Tests that paths resolve to user-provided locations when they exist.
         """
-        print("\nTesting path resolution (user overrides exist)...")
 
-        mock_is_file.return_value = True
-        mock_is_dir.return_value = True
+        self._touch("config.yaml")
+        self._touch("prompts/prompt_legatus.txt")
+        self._touch("prompts/prompt_inquisitor.txt")
+        self._touch("project_data/libs.versions.toml")
+        (self.mock_project_root / "data").mkdir()
+        (self.mock_project_root / "reports").mkdir()
 
         paths = resolve_paths(self.mock_project_root)
 
@@ -31,17 +40,12 @@ class TestPaths(unittest.TestCase):
         self.assertEqual(paths.inquisitor_prompt, self.mock_project_root / "prompts" / "prompt_inquisitor.txt")
         self.assertEqual(paths.report_dir, self.mock_project_root / "reports")
         self.assertEqual(paths.version_catalog, self.mock_project_root / "project_data" / "libs.versions.toml")
+        self.assertEqual(paths.context_embedding_cache, self.mock_project_root / "data" / "context_embedding.npz")
 
-    @patch('src.legatus_ai.paths.Path.is_dir')
-    @patch('src.legatus_ai.paths.Path.is_file')
-    def test_paths_when_user_files_are_missing(self, mock_is_file, mock_is_dir):
+    def test_paths_when_user_files_are_missing(self):
         """
         Tests that paths resolve to internal fallback locations when user files are missing.
         """
-        print("\nTesting path resolution (fallbacks)...")
-
-        mock_is_file.return_value = False
-        mock_is_dir.return_value = False
 
         paths = resolve_paths(self.mock_project_root)
 
@@ -54,30 +58,17 @@ class TestPaths(unittest.TestCase):
         self.assertEqual(paths.report_dir, self.mock_project_root / "reports")
         self.assertIsNone(paths.version_catalog)
 
-    @patch('src.legatus_ai.paths.Path.is_dir')
-    @patch('src.legatus_ai.paths.Path.is_file')
-    def test_paths_mixed_scenario(self, mock_is_file, mock_is_dir):
+    def test_paths_mixed_scenario(self):
         """
         Tests a mixed scenario where some user files exist and some do not.
         """
-        print("\nTesting path resolution (mixed user/default)...")
 
         # --- ARRANGE ---
-        # The mock will return the next item from this list each time it's called.
-        # The order must match the order of calls in the resolve_paths function.
-        mock_is_file.side_effect = [
-            True,  # 1. user_config_path.is_file() -> True (user config exists)
-            True,  # 2. user_legatus_prompt.is_file() -> True (user prompt exists)
-            False,  # 3. user_inquisitor_prompt.is_file() -> False (fallback)
-            False  # 4. user_version_catalog.is_file() -> False (fallback)
-        ]
-
-        # is_dir is called for data and reports directories.
-        # Let's say neither exists.
-        mock_is_dir.side_effect = [
-            False,  # 1. user_data_dir.is_dir() -> False (fallback)
-            False  # 2. user_reports_dir.is_dir() -> False (fallback)
-        ]
+        # Only the config and the Legatus prompt are provided by the user.
+        self._touch("config.yaml")
+        self._touch("prompts/prompt_legatus.txt")
+        # A directory where a file is expected must not count as an override.
+        (self.mock_project_root / "project_data" / "libs.versions.toml").mkdir(parents=True)
 
         # --- ACT ---
         paths = resolve_paths(self.mock_project_root)
@@ -94,6 +85,19 @@ class TestPaths(unittest.TestCase):
         self.assertEqual(paths.report_dir, self.mock_project_root / "reports")  # Fallback
         self.assertIsNone(paths.version_catalog)  # Fallback
 
+    def test_missing_project_root_falls_back_to_defaults(self):
+        """
+        Tests that an unreadable or missing project root is treated as having no overrides.
+        """
+
+        missing_root = self.mock_project_root / "does-not-exist"
+
+        paths = resolve_paths(missing_root)
+
+        self.assertIsInstance(paths, ApplicationPaths)
+        self.assertEqual(paths.config, Path("config.yaml"))
+        self.assertIsNone(paths.version_catalog)
+
 
 if __name__ == '__main__':
     unittest.main()
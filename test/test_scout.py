@@ -1,21 +1,35 @@
 import unittest
 import asyncio
+import tempfile
+from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 # Import the functions to be tested
-from src.legatus_ai.scout import _extract_summary, run_scout_async, fetch_from_rss_async
+from src.legatus_ai.scout import (
+    _extract_summary, _parse_feed, run_scout_async, fetch_from_rss_async, fetch_from_github_releases_async,
+    load_feed_cache, save_feed_cache, restore_feed_validators
+)
 
 # Import AppConfig to build typed mock configs
 from src.legatus_ai.config import AppConfig
 
 
+def _mock_session_returning(response) -> MagicMock:
+    """Builds a mock aiohttp session whose ``async with session.get(...)`` yields ``response``."""
+    context_manager = MagicMock()
+    context_manager.__aenter__ = AsyncMock(return_value=response)
+    context_manager.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.get.return_value = context_manager
+    return session
+
+
 # We use a standard TestCase for the synchronous function _extract_summary
 class TestScoutUtilities(unittest.TestCase):
     def test_extract_summary_priority(self):
         """Tests that the summary extraction prefers content > summary > description."""
-        print("\nTesting summary extraction logic...")
         entry1 = SimpleNamespace(
             summary="This is the summary.",
             description="This is the description.",
@@ -24,6 +38,122 @@ class TestScoutUtilities(unittest.TestCase):
         self.assertEqual(_extract_summary(entry1), "This is HTML content.")
         # ... (other test cases for summary extraction)
 
+    def test_extract_summary_drops_non_text_and_truncates(self):
+        """Tests that scripts, styles and comments are ignored and long content is truncated."""
+        entry = SimpleNamespace(content=[SimpleNamespace(
+            value="<style>p {}</style><p>Intro</p><!-- hidden --><script>var x;</script>tail<br>end"
+        )])
+        self.assertEqual(_extract_summary(entry), "Intro tail end")
+
+        long_entry = SimpleNamespace(content=[SimpleNamespace(value="<p>" + "word " * 200 + "</p>")])
+        summary = _extract_summary(long_entry)
+        self.assertEqual(len(summary), 403)
+        self.assertTrue(summary.endswith("..."))
+
+
+class TestScoutFeedParsing(unittest.TestCase):
+    RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>Blog</title>
+    <item>
+      <title>Release 2.0</title>
+      <link>/posts/release-2</link>
+      <pubDate>Tue, 10 Jun 2025 04:00:00 +0200</pubDate>
+      <category>Kotlin</category>
+      <category>Android</category>
+      <description>Short description.</description>
+      <content:encoded><![CDATA[<p>Full <b>content</b>.</p>]]></content:encoded>
+    </item>
+    <item>
+      <title>No link</title>
+      <guid isPermaLink="true">https://example.com/guid-link</guid>
+    </item>
+  </channel>
+</rss>"""
+
+    ATOM_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom Blog</title>
+  <entry>
+    <title>Atom Post</title>
+    <link rel="edit" href="https://example.com/edit/1"/>
+    <link href="https://example.com/posts/1"/>
+    <updated>2025-06-10T02:00:00Z</updated>
+    <category term="Gradle"/>
+    <summary>Atom summary.</summary>
+  </entry>
+</feed>"""
+
+    def test_parse_rss_feed(self):
+        """Tests that RSS 2.0 items are parsed into feedparser-style entries."""
+        entries = _parse_feed(self.RSS_FEED)
+
+        self.assertEqual(len(entries), 2)
+        first = entries[0]
+        self.assertEqual(first.title, "Release 2.0")
+        self.assertEqual(first.link, "/posts/release-2")
+        self.assertEqual(tuple(first.published_parsed)[:6], (2025, 6, 10, 2, 0, 0))
+        self.assertEqual([tag.term for tag in first.tags], ["Kotlin", "Android"])
+        self.assertEqual(_extract_summary(first), "Full content .")
+        self.assertEqual(entries[1].link, "https://example.com/guid-link")
+        self.assertIsNone(entries[1].published_parsed)
+
+    def test_parse_atom_feed(self):
+        """Tests that Atom entries are parsed, using the alternate link."""
+        entries = _parse_feed(self.ATOM_FEED)
+
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertEqual(entry.title, "Atom Post")
+        self.assertEqual(entry.link, "https://example.com/posts/1")
+        self.assertEqual(tuple(entry.published_parsed)[:6], (2025, 6, 10, 2, 0, 0))
+        self.assertEqual([tag.term for tag in entry.tags], ["Gradle"])
+        self.assertEqual(_extract_summary(entry), "Atom summary.")
+
+    @patch('feedparser.parse')
+    def test_parse_feed_falls_back_to_feedparser(self, mock_parse):
+        """Tests that documents lxml cannot handle are passed to feedparser."""
+        mock_parse.return_value = SimpleNamespace(bozo=0, entries=["entry"])
+
+        self.assertEqual(_parse_feed(b"<rss><item>unclosed"), ["entry"])
+        mock_parse.assert_called_once_with(b"<rss><item>unclosed")
+
+        mock_parse.return_value = SimpleNamespace(bozo=1, bozo_exception="broken", entries=[])
+        with self.assertRaises(ValueError):
+            _parse_feed(b"not a feed")
+
+
+class TestScoutFeedCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_path = Path(tmp.name) / "data" / "feed_cache.json"
+
+    def test_feed_cache_round_trip(self):
+        """Tests that saved validators are loaded back unchanged."""
+        cache = {"http://a.com/feed": {"etag": '"v1"', "last_modified": "Tue, 10 Jun 2025 02:00:00 GMT"}}
+        save_feed_cache(self.cache_path, cache)
+        self.assertEqual(load_feed_cache(self.cache_path), cache)
+
+    def test_missing_or_corrupt_feed_cache_is_empty(self):
+        """Tests that an absent or unreadable cache yields an empty mapping."""
+        self.assertEqual(load_feed_cache(None), {})
+        self.assertEqual(load_feed_cache(self.cache_path), {})
+
+        self.cache_path.parent.mkdir()
+        self.cache_path.write_text("{not json")
+        self.assertEqual(load_feed_cache(self.cache_path), {})
+
+    def test_restore_feed_validators(self):
+        """Tests that failed feeds get their previous validators back, or none if they had none."""
+        previous = {"http://a.com/feed": {"etag": '"v1"'}}
+        cache = {"http://a.com/feed": {"etag": '"v2"'}, "http://b.com/feed": {"etag": '"new"'},
+                 "http://c.com/feed": {"etag": '"ok"'}}
+
+        restore_feed_validators(cache, previous, {"http://a.com/feed", "http://b.com/feed"})
+
+        self.assertEqual(cache, {"http://a.com/feed": {"etag": '"v1"'}, "http://c.com/feed": {"etag": '"ok"'}})
 
 # We use IsolatedAsyncioTestCase for testing the async functions
 class TestScoutAsyncOperations(unittest.IsolatedAsyncioTestCase):
@@ -33,38 +163,33 @@ class TestScoutAsyncOperations(unittest.IsolatedAsyncioTestCase):
         """
         Tests the async RSS fetching function on a successful run.
         """
-        print("\nTesting RSS fetching logic (successful run)...")
 
         # --- ARRANGE ---
-        # 1. Mock the final parsed feed object
-        mock_feed = MagicMock()
-        mock_feed.bozo = 0
+        # 1. Mock the parsed feed entries
         mock_entry = SimpleNamespace(
             title="New Article", link="/new-post",
             published_parsed=(datetime.now(timezone.utc) - timedelta(hours=1)).timetuple(),
             summary="Article summary here.",
             tags=[SimpleNamespace(term="Kotlin")]
         )
-        mock_feed.entries = [mock_entry]
 
-        # 2. Mock the executor to return the parsed feed
+        old_entry = SimpleNamespace(
+            title="Old Article", link="/old-post",
+            published_parsed=(datetime.now(timezone.utc) - timedelta(hours=48)).timetuple(),
+            summary="Old summary."
+        )
+        undated_entry = SimpleNamespace(title="Undated Article", link="/undated", published_parsed=None)
+
+        # 2. Mock the executor to return the parsed entries
         mock_loop = MagicMock()
-        mock_loop.run_in_executor = AsyncMock(return_value=mock_feed)
+        mock_loop.run_in_executor = AsyncMock(return_value=[old_entry, mock_entry, undated_entry])
         mock_get_running_loop.return_value = mock_loop
 
-        mock_session = MagicMock()
-
-        # Create the mock response object that the context manager will yield.
-        mock_response = AsyncMock()
-        mock_response.text = AsyncMock(return_value="dummy rss content")
-        mock_response.raise_for_status.return_value = None
-
-        # Create the async context manager mock.
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__.return_value = mock_response
-
-        # Configure the synchronous .get() method to return our context manager.
-        mock_session.get.return_value = mock_context_manager
+        # 3. Mock the response the session's get() context manager yields. Only
+        # read() is a coroutine; raise_for_status() is a plain method.
+        mock_response = MagicMock()
+        mock_response.read = AsyncMock(return_value=b"dummy rss content")
+        mock_session = _mock_session_returning(mock_response)
 
         # 4. Define the typed config
         mock_config = AppConfig.model_validate({
@@ -77,14 +202,122 @@ class TestScoutAsyncOperations(unittest.IsolatedAsyncioTestCase):
         # --- ASSERT ---
         self.assertEqual(len(articles), 1)
         self.assertEqual(articles[0]['title'], 'New Article')
+        self.assertEqual(articles[0]['link'], 'http://fake-feed.com/new-post')
+        self.assertEqual(articles[0]['feed'], 'http://fake-feed.com/rss')
+        self.assertEqual(
+            articles[0]['published'],
+            datetime(*mock_entry.published_parsed[:6], tzinfo=timezone.utc).isoformat()
+        )
         mock_loop.run_in_executor.assert_called_once()
+        # Feeds are parsed on the loop's default thread executor
+        self.assertIsNone(mock_loop.run_in_executor.call_args.args[0])
+
+    async def test_fetch_from_rss_async_not_modified(self):
+        """
+        Tests that cached validators are sent and a 304 response skips parsing.
+        """
+
+        # --- ARRANGE ---
+        mock_response = MagicMock()
+        mock_response.status = 304
+        mock_session = _mock_session_returning(mock_response)
+
+        feed_url = 'http://fake-feed.com/rss'
+        feed_cache = {feed_url: {"etag": '"v1"', "last_modified": "Tue, 10 Jun 2025 02:00:00 GMT"}}
+
+        # --- ACT ---
+        articles = await fetch_from_rss_async(mock_session, AppConfig(), feed_url, feed_cache)
+
+        # --- ASSERT ---
+        self.assertEqual(articles, [])
+        self.assertEqual(mock_session.get.call_args.kwargs['headers'], {
+            "If-None-Match": '"v1"', "If-Modified-Since": "Tue, 10 Jun 2025 02:00:00 GMT"
+        })
+        mock_response.read.assert_not_called()
+
+    @patch('src.legatus_ai.scout._parse_feed', return_value=[])
+    async def test_fetch_from_rss_async_updates_feed_cache(self, mock_parse_feed):
+        """
+        Tests that the validators of a full response are stored in the feed cache.
+        """
+
+        # --- ARRANGE ---
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {"ETag": '"v2"'}
+        mock_response.read = AsyncMock(return_value=b"<rss/>")
+        mock_session = _mock_session_returning(mock_response)
+
+        feed_url = 'http://fake-feed.com/rss'
+        feed_cache = {}
+
+        # --- ACT ---
+        await fetch_from_rss_async(mock_session, AppConfig(), feed_url, feed_cache)
+
+        # --- ASSERT ---
+        self.assertIsNone(mock_session.get.call_args.kwargs['headers'])
+        self.assertEqual(feed_cache, {feed_url: {"etag": '"v2"'}})
+        mock_parse_feed.assert_called_once_with(b"<rss/>")
+
+    @patch('src.legatus_ai.scout._parse_feed', side_effect=ValueError("Malformed feed"))
+    async def test_fetch_from_rss_async_keeps_validators_of_unparsed_feed(self, mock_parse_feed):
+        """
+        Tests that a feed which cannot be parsed does not replace its cached validators.
+        """
+
+        # --- ARRANGE ---
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {"ETag": '"v2"'}
+        mock_response.read = AsyncMock(return_value=b"<rss")
+        mock_session = _mock_session_returning(mock_response)
+
+        feed_url = 'http://fake-feed.com/rss'
+        feed_cache = {feed_url: {"etag": '"v1"'}}
+
+        # --- ACT ---
+        articles = await fetch_from_rss_async(mock_session, AppConfig(), feed_url, feed_cache)
+
+        # --- ASSERT ---
+        self.assertEqual(articles, [])
+        self.assertEqual(feed_cache, {feed_url: {"etag": '"v1"'}})
+
+    async def test_fetch_from_github_releases_async_success(self):
+        """
+        Tests that GitHub releases are decoded from the raw response bytes and filtered by age.
+        """
+
+        # --- ARRANGE ---
+        recent = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        payload = (
+            '[{"name": "v2.0", "html_url": "https://github.com/o/r/releases/v2.0", '
+            f'"published_at": "{recent}", "body": "Notes"}}, '
+            '{"name": "v1.0", "published_at": "2000-01-01T00:00:00Z", "body": "Old"}, '
+            '{"name": "draft", "published_at": null}]'
+        ).encode()
+
+        mock_response = MagicMock()
+        mock_response.read = AsyncMock(return_value=payload)
+        mock_session = _mock_session_returning(mock_response)
+
+        mock_config = AppConfig.model_validate({"analysis_rules": {"lookback_period_hours": 24}})
+
+        # --- ACT ---
+        articles = await fetch_from_github_releases_async(mock_session, mock_config, "o/r")
+
+        # --- ASSERT ---
+        self.assertEqual(len(articles), 1)
+        self.assertEqual(articles[0]['title'], "GitHub Release: v2.0")
+        self.assertEqual(articles[0]['link'], "https://github.com/o/r/releases/v2.0")
+        self.assertEqual(articles[0]['summary'], "Notes...")
+        self.assertEqual(articles[0]['published'], recent)
+        mock_response.read.assert_awaited_once()
 
     @patch('src.legatus_ai.scout.SOURCE_FETCHER_MAP', new_callable=dict)
     async def test_run_scout_orchestrator_async(self, mock_fetcher_map):
         """
         Tests the async Scout orchestrator directly.
         """
-        print("\nTesting Scout's async orchestrator...")
 
         # --- ARRANGE ---
         mock_rss_fetcher = AsyncMock(return_value=[{'title': 'RSS Article'}])
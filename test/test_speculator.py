@@ -1,8 +1,15 @@
+import asyncio
 import unittest
 from unittest.mock import patch, MagicMock, AsyncMock
 
+import aiohttp
+
 # Import the function to be tested AND the class we need to spec
-from src.legatus_ai.speculator import run_speculator
+from src.legatus_ai.speculator import (
+    run_speculator,
+    _fetch_and_parse_article_content_async,
+    _parse_llm_json_response,
+)
 from langchain_core.runnables import Runnable
 
 # Import AppConfig to build typed mock configs
@@ -17,7 +24,6 @@ class TestSpeculator(unittest.TestCase):
         Tests that the run_speculator orchestrator correctly gathers results
         from its worker function and filters out failures (None results).
         """
-        print("\nTesting Speculator's orchestration logic...")
 
         # --- ARRANGE ---
         mock_ai_chain = MagicMock(spec=Runnable)
@@ -62,6 +68,215 @@ class TestSpeculator(unittest.TestCase):
         self.assertEqual(first_call_args[2], mock_ai_chain)
         self.assertEqual(first_call_args[3], mock_config)
 
+    def test_run_speculator_result_mixes(self):
+        """
+        Tests that run_speculator keeps exactly the successful analyses, in article order,
+        whether all, some or none of the workers succeed.
+        """
+        # --- ARRANGE ---
+        articles = [
+            {'title': 'First Article', 'link': 'http://a.com', 'summary': 'Summary 1'},
+            {'title': 'Second Article', 'link': 'http://b.com', 'summary': 'Summary 2'}
+        ]
+        first, second = ({**article, 'analysis': {}} for article in articles)
+        scenarios = [
+            ("all succeed", [first, second], [first, second]),
+            ("only the second succeeds", [None, second], [second]),
+            ("all fail", [None, None], []),
+        ]
+
+        for name, worker_results, expected in scenarios:
+            with self.subTest(name), \
+                    patch('src.legatus_ai.speculator._analyze_single_article', new_callable=AsyncMock) as mock_analyze:
+                mock_analyze.side_effect = worker_results
+
+                # --- ACT ---
+                results = run_speculator(articles, MagicMock(spec=Runnable), AppConfig())
+
+                # --- ASSERT ---
+                self.assertEqual(results, expected)
+                self.assertEqual(mock_analyze.call_count, len(articles))
+
+    @patch('src.legatus_ai.speculator._fetch_and_parse_article_content_async', new_callable=AsyncMock)
+    def test_failed_analyses_are_reported(self, mock_fetch):
+        """
+        Tests that articles whose fetch or LLM call failed are reported, while
+        articles the LLM judged irrelevant are not.
+        """
+        # --- ARRANGE ---
+        articles = [
+            {'title': 'Unreachable', 'link': 'http://a.com', 'summary': ''},
+            {'title': 'LLM Error', 'link': 'http://b.com', 'summary': ''},
+            {'title': 'Irrelevant', 'link': 'http://c.com', 'summary': ''},
+        ]
+        mock_fetch.side_effect = lambda session, url, config: None if url == 'http://a.com' else "Full text"
+
+        def llm_reply(prompt_data):
+            if prompt_data['title'] == 'LLM Error':
+                raise RuntimeError("quota exceeded")
+            return '{"is_relevant": false, "criticality_score": 1}'
+
+        mock_ai_chain = MagicMock(spec=Runnable)
+        mock_ai_chain.ainvoke = AsyncMock(side_effect=llm_reply)
+        failed_links = set()
+
+        # --- ACT ---
+        with patch('src.legatus_ai.speculator.logging'):
+            results = run_speculator(articles, mock_ai_chain, AppConfig(), failed_links)
+
+        # --- ASSERT ---
+        self.assertEqual(results, [])
+        self.assertEqual(failed_links, {'http://a.com', 'http://b.com'})
+
+    def test_fetch_network_error_is_handled(self):
+        """
+        Tests that a network error while fetching one article is logged and
+        reported as None, so the other concurrent analyses keep running.
+        """
+
+        # --- ARRANGE ---
+        mock_session = MagicMock()
+        mock_session.get.return_value.__aenter__.side_effect = aiohttp.ClientError("connection reset")
+        mock_config = AppConfig.model_validate({})
+
+        # --- ACT ---
+        with patch('src.legatus_ai.speculator.logging') as mock_logging:
+            result = asyncio.run(
+                _fetch_and_parse_article_content_async(mock_session, "https://example.com/post", mock_config)
+            )
+
+        # --- ASSERT ---
+        self.assertIsNone(result)
+        mock_logging.error.assert_called_once()
+        self.assertIn("Network error", mock_logging.error.call_args.args[0])
+
+
+    @patch('src.legatus_ai.speculator._analyze_single_article', new_callable=AsyncMock)
+    def test_duplicate_links_are_analyzed_once(self, mock_analyze_single):
+        """
+        Tests that articles reported by several sources under the same link are analyzed once.
+        """
+
+        # --- ARRANGE ---
+        mock_analyze_single.return_value = None
+        articles = [
+            {'title': 'Release 1.0', 'link': 'http://a.com/1.0'},
+            {'title': 'Release 1.0 (feed)', 'link': 'http://a.com/1.0'},
+            {'title': 'Other', 'link': 'http://b.com'},
+        ]
+
+        # --- ACT ---
+        run_speculator(articles, MagicMock(spec=Runnable), AppConfig())
+
+        # --- ASSERT ---
+        self.assertEqual(mock_analyze_single.call_count, 2)
+        analyzed_titles = [c.args[1]['title'] for c in mock_analyze_single.call_args_list]
+        self.assertEqual(analyzed_titles, ['Release 1.0', 'Other'])
+
+
+class TestSpeculatorResponseParsing(unittest.TestCase):
+
+    def test_fenced_response_is_validated(self):
+        """
+        Tests that a fenced JSON answer is parsed into a typed Analysis with a numeric score.
+        """
+
+        raw_response = (
+            'Here you go:\n```json\n{"is_relevant": true, "summary": "Update now.", '
+            '"criticality_score": "4", "justification": "Security fix.", "tags": ["retrofit"]}\n```'
+        )
+
+        analysis = _parse_llm_json_response(raw_response, "Retrofit 3")
+
+        self.assertTrue(analysis.is_relevant)
+        self.assertEqual(analysis.criticality_score, 4)
+        self.assertEqual(analysis.model_dump(exclude_none=True)['tags'], ["retrofit"])
+
+    def test_bare_json_response_skips_extraction(self):
+        """
+        Tests that a JSON-mode reply is validated directly, without the regex fallback.
+        """
+
+        with patch('src.legatus_ai.speculator._find_fenced_json') as mock_find_fenced, \
+                patch('src.legatus_ai.speculator._find_json_object') as mock_find:
+            analysis = _parse_llm_json_response('{"is_relevant": false, "criticality_score": 1}', "Post")
+
+        mock_find_fenced.assert_not_called()
+        mock_find.assert_not_called()
+        self.assertFalse(analysis.is_relevant)
+        self.assertEqual(analysis.criticality_score, 1)
+
+    def test_loosely_typed_reply_is_accepted(self):
+        """
+        Tests that null, worded or numeric values are coerced instead of failing validation.
+        """
+        replies = [
+            ('{"is_relevant": null, "summary": 42, "criticality_score": 1}', False, "42", None),
+            ('{"is_relevant": "Yes", "justification": 3.5, "criticality_score": "4"}', True, None, "3.5"),
+        ]
+
+        for raw_response, is_relevant, summary, justification in replies:
+            with self.subTest(raw_response):
+                analysis = _parse_llm_json_response(raw_response, "Post")
+
+                self.assertIsNotNone(analysis)
+                self.assertIs(analysis.is_relevant, is_relevant)
+                self.assertEqual(analysis.summary, summary)
+                self.assertEqual(analysis.justification, justification)
+
+    def test_first_fenced_object_is_used(self):
+        """
+        Tests that fences without a JSON object are skipped and the first fenced object wins.
+        """
+
+        raw_response = (
+            '```json\n["not", "an", "object"]\n```\n'
+            '```json\n{"is_relevant": true, "criticality_score": 2}\n```\n'
+            '```json\n{"is_relevant": false}\n```'
+        )
+
+        analysis = _parse_llm_json_response(raw_response, "Post")
+
+        self.assertTrue(analysis.is_relevant)
+        self.assertEqual(analysis.criticality_score, 2)
+
+    def test_nested_json_in_prose_is_extracted(self):
+        """
+        Tests that an unfenced object with nested braces and braces in strings is extracted whole.
+        """
+
+        raw_response = (
+            'Sure! {"is_relevant": true, "summary": "Use {braces} and \\"quotes\\"", '
+            '"details": {"module": "core"}, "criticality_score": 3} Hope that helps {:}'
+        )
+
+        analysis = _parse_llm_json_response(raw_response, "Post")
+
+        self.assertEqual(analysis.summary, 'Use {braces} and "quotes"')
+        self.assertEqual(analysis.model_dump()['details'], {"module": "core"})
+        self.assertEqual(analysis.criticality_score, 3)
+
+    def test_missing_and_unparseable_fields(self):
+        """
+        Tests that omitted fields are left out of the dump and a bad score becomes None.
+        """
+
+        analysis = _parse_llm_json_response('{"is_relevant": true, "criticality_score": "high"}', "Post")
+
+        self.assertIsNone(analysis.criticality_score)
+        self.assertEqual(analysis.model_dump(exclude_none=True), {"is_relevant": True})
+
+    def test_invalid_json_returns_none(self):
+        """
+        Tests that malformed JSON is logged and reported as None.
+        """
+
+        with patch('src.legatus_ai.speculator.logging') as mock_logging:
+            self.assertIsNone(_parse_llm_json_response('{"is_relevant": tru}', "Post"))
+            self.assertIsNone(_parse_llm_json_response('no json here', "Post"))
+
+        self.assertEqual(mock_logging.error.call_count, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
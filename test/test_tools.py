@@ -4,6 +4,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
 
 # Import the functions to be tested
+from src.legatus_ai import tools
 from src.legatus_ai.tools import create_sql_query_tool, create_web_fetcher_tool
 
 # Import AppConfig to build typed mock configs
@@ -12,29 +13,34 @@ from src.legatus_ai.config import AppConfig
 
 class TestTools(unittest.TestCase):
 
+    def setUp(self):
+        # The fetcher's session is shared at module level, so start each test without one.
+        tools._shared_session = None
+        self.addCleanup(setattr, tools, '_shared_session', None)
+
+    @patch('src.legatus_ai.tools.aiohttp.TCPConnector')
     @patch('src.legatus_ai.tools.aiohttp.ClientSession')
-    def test_create_web_fetcher_tool(self, mock_client_session):
+    def test_create_web_fetcher_tool(self, mock_client_session, mock_connector):
         """Tests the web content fetching tool created by the factory."""
-        print("\nTesting create_web_fetcher_tool...")
 
         # --- ARRANGE ---
-        # 1. Create the FINAL object: the mock response.
-        mock_response = AsyncMock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.text = AsyncMock(return_value="<html><body><p>Hello World</p></body></html>")
+        # 1. Create the FINAL object: the mock response. Only read() is awaited.
+        mock_response = MagicMock()
+        mock_response.read = AsyncMock(return_value=b"<html><body><p>Hello World</p></body></html>")
 
         # 2. Create the context manager that will produce the mock response.
-        mock_response_cm = AsyncMock()
-        mock_response_cm.__aenter__.return_value = mock_response
+        mock_response_cm = MagicMock()
+        mock_response_cm.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response_cm.__aexit__ = AsyncMock(return_value=False)
 
         # 3. Create the mock session object.
-        mock_session = AsyncMock()
+        mock_session = MagicMock()
+        mock_session.closed = False
 
         mock_session.get = MagicMock(return_value=mock_response_cm)
 
-        # 5. Configure the main patched class to produce the mock session
-        #    when its context manager is entered.
-        mock_client_session.return_value.__aenter__.return_value = mock_session
+        # 5. Configure the main patched class to produce the mock session.
+        mock_client_session.return_value = mock_session
 
         # 6. Define a typed config for the factory
         mock_config = AppConfig.model_validate({
@@ -48,25 +54,33 @@ class TestTools(unittest.TestCase):
         # --- ACT ---
         web_fetcher_tool = create_web_fetcher_tool(mock_config)
         tool_coroutine = web_fetcher_tool.coroutine
-        result = asyncio.run(tool_coroutine("http://example.com"))
+
+        async def fetch_twice():
+            first = await tool_coroutine("http://example.com")
+            await tool_coroutine("http://example.com/other")
+            return first
+
+        result = asyncio.run(fetch_twice())
 
         # --- ASSERT ---
         self.assertIn("Hello World", result)
 
+        # The session is created once and reused for every fetch on the same loop
+        mock_client_session.assert_called_once()
+        self.assertEqual(mock_session.get.call_count, 2)
+
         # Verify that the session's get method was called with configured values
-        mock_session.get.assert_called_once()
         get_call_kwargs = mock_session.get.call_args.kwargs
         self.assertEqual(get_call_kwargs['headers']['User-Agent'], "TestAgent/1.0")
         self.assertEqual(get_call_kwargs['timeout'], 10)
 
     @patch('src.legatus_ai.tools.Path.is_file', return_value=True)
-    @patch('src.legatus_ai.tools.SQLDatabase')
-    @patch('src.legatus_ai.tools.QuerySQLDatabaseTool')
+    @patch('langchain_community.utilities.SQLDatabase')
+    @patch('langchain_community.tools.QuerySQLDatabaseTool')
     def test_create_sql_query_tool_db_exists(self, mock_query_tool, mock_sql_db, mock_is_file):
         """
         Tests the creation of the SQL query tool when the database file exists.
         """
-        print("\nTesting create_sql_query_tool (DB exists)...")
 
         # --- ARRANGE ---
         mock_db_path = Path("/mock/db.sqlite")
@@ -91,7 +105,6 @@ class TestTools(unittest.TestCase):
         """
         Tests that a dummy tool is created if the database file is missing.
         """
-        print("\nTesting create_sql_query_tool (DB missing)...")
 
         # --- ARRANGE ---
         mock_db_path = Path("/nonexistent/db.sqlite")
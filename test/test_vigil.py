@@ -1,15 +1,29 @@
+import os
+import tempfile
+import threading
 import unittest
+from pathlib import Path
+from typing import List
 from unittest.mock import patch, MagicMock
-import torch
 import numpy as np
+import torch
 
 # Import the function to be tested
-from src.legatus_ai.vigil import filter_articles
+from src.legatus_ai.vigil import filter_articles, _get_embedding_model, close_embedding_cache, configure_torch_threads
 
 # Import AppConfig to build typed mock configs
 from src.legatus_ai.config import AppConfig
 
 
+def _unit_embeddings(scores: List[float]) -> np.ndarray:
+    """
+    Builds unit-length 2D embeddings whose cosine similarity with the
+    project vector [1, 0] equals the given scores.
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    return np.stack([scores, np.sqrt(1.0 - scores ** 2)], axis=1)
+
+
 class TestVigil(unittest.TestCase):
 
     def setUp(self):
@@ -22,27 +36,24 @@ class TestVigil(unittest.TestCase):
         """Stop the patcher."""
         self.cache_patcher.stop()
 
-    @patch('src.legatus_ai.vigil.util.cos_sim')
     @patch('src.legatus_ai.vigil.SentenceTransformer')
-    def test_filter_articles_semantically(self, mock_sentence_transformer, mock_cos_sim):
+    def test_filter_articles_semantically(self, mock_sentence_transformer):
         """Tests Vigil's semantic filtering based on a configurable threshold."""
-        print("\nTesting Vigil semantic filtering...")
 
         # --- ARRANGE ---
         mock_model_instance = MagicMock()
-        mock_model_instance.encode.return_value = torch.tensor([])  # Return a tensor
-        mock_sentence_transformer.return_value = mock_model_instance
-
         # Scores: [Relevant, Irrelevant, Also Relevant]
-        mock_scores = torch.tensor([[0.8, 0.2, 0.5]])
-        mock_cos_sim.return_value = mock_scores
+        mock_model_instance.encode.return_value = _unit_embeddings([0.8, 0.2, 0.5])
+        mock_model_instance.device.type = "cpu"
+        mock_sentence_transformer.return_value = mock_model_instance
 
         articles = [
             {'title': 'Relevant Article', 'link': 'http://a.com', 'summary': '...'},
             {'title': 'Irrelevant Article', 'link': 'http://b.com', 'summary': '...'},
             {'title': 'Also Relevant Article', 'link': 'http://c.com', 'summary': '...'}
         ]
-        mock_context = {"embedding": np.array([0.1, 0.2])}  # Use a real numpy array
+        # Not unit length: Vigil must normalize the project embedding itself.
+        mock_context = {"embedding": np.array([3.0, 0.0])}
 
         # Define a typed config that sets the threshold to 0.4
         mock_config = AppConfig.model_validate({
@@ -59,12 +70,12 @@ class TestVigil(unittest.TestCase):
         filtered = filter_articles(articles, mock_context, mock_config)
 
         # --- ASSERT ---
-        # Verify the correct, configurable model name was used
-        mock_sentence_transformer.assert_called_once_with("mock-model-name")
+        # Verify the correct, configurable model name was used, pinned to the CPU by default
+        mock_sentence_transformer.assert_called_once_with("mock-model-name", device="cpu")
         mock_model_instance.encode.assert_called_once()
-
-        # Verify cosine similarity was called correctly
-        self.assertEqual(mock_cos_sim.call_count, 1)
+        self.assertTrue(mock_model_instance.encode.call_args.kwargs['normalize_embeddings'])
+        # Small batches are used on the CPU unless a batch size is configured.
+        self.assertEqual(mock_model_instance.encode.call_args.kwargs['batch_size'], 8)
 
         # With a threshold of 0.4, two articles should pass (0.8 and 0.5)
         self.assertEqual(len(filtered), 2)
@@ -78,15 +89,11 @@ class TestVigil(unittest.TestCase):
 
     @patch('src.legatus_ai.vigil._get_embedding_model')  # Mock the whole model loader
     def test_deduplication_logic(self, mock_get_model):
-        """Tests that duplicate articles (by link) are removed."""
-        print("\nTesting Vigil deduplication logic...")
+        """Tests that duplicate articles (by link) are removed before embedding."""
 
         # --- ARRANGE ---
-        # Mock the model and similarity calculation to focus only on deduplication
-        mock_cos_sim_patcher = patch('src.legatus_ai.vigil.util.cos_sim')
-        mock_cos_sim = mock_cos_sim_patcher.start()
-        # Pretend all articles are highly relevant
-        mock_cos_sim.return_value = torch.tensor([[0.9, 0.9, 0.9]])
+        # Mock the model to focus only on deduplication; all articles are highly relevant
+        mock_get_model.return_value.encode.return_value = _unit_embeddings([0.9, 0.9])
 
         # Article list with a duplicate link
         articles = [
@@ -94,7 +101,7 @@ class TestVigil(unittest.TestCase):
             {'title': 'Article B', 'link': 'http://b.com', 'summary': 'Unique'},
             {'title': 'Article A Duplicate', 'link': 'http://a.com', 'summary': 'Second instance'}
         ]
-        mock_context = {"embedding": np.array([0.1, 0.2])}
+        mock_context = {"embedding": np.array([1.0, 0.0])}
         mock_config = AppConfig.model_validate({
             "analysis_rules": {"vigil_similarity_threshold": 0.5}
         })
@@ -104,13 +111,157 @@ class TestVigil(unittest.TestCase):
 
         # --- ASSERT ---
         self.assertEqual(len(filtered), 2)  # Should keep A and B, discard the duplicate A
+        # The duplicate was dropped before encoding, so only two texts reached the model.
+        encoded_texts = mock_get_model.return_value.encode.call_args.args[0]
+        self.assertEqual(encoded_texts, ['Article A. First instance', 'Article B. Unique'])
 
         # Verify that the *first* instance of the duplicated article was kept
         kept_links = {a['link']: a for a in filtered}
         self.assertEqual(kept_links['http://a.com']['summary'], 'First instance')
 
-        mock_cos_sim_patcher.stop()
+    @patch('src.legatus_ai.vigil._get_embedding_model')
+    def test_disabled_filter_skips_embedding(self, mock_get_model):
+        """Tests that a disabled Vigil only deduplicates, without loading the model."""
+
+        # --- ARRANGE ---
+        articles = [
+            {'title': 'Article A', 'link': 'http://a.com', 'summary': 'First instance'},
+            {'title': 'Article A Duplicate', 'link': 'http://a.com', 'summary': 'Second instance'},
+            {'title': 'Article B', 'link': 'http://b.com', 'summary': 'Unique'}
+        ]
+        disabled_config = AppConfig.model_validate({"analysis_rules": {"vigil_disable": True}})
+        accept_all_config = AppConfig.model_validate({"analysis_rules": {"vigil_similarity_threshold": -1.0}})
+
+        for config in (disabled_config, accept_all_config):
+            # --- ACT ---
+            filtered = filter_articles(articles, {}, config)
+
+            # --- ASSERT ---
+            self.assertEqual([a['summary'] for a in filtered], ['First instance', 'Unique'])
+        mock_get_model.assert_not_called()
+
+    @patch('src.legatus_ai.vigil._get_embedding_model')
+    def test_empty_batch_skips_embedding(self, mock_get_model):
+        """Tests that the model is not loaded when no article is left to score."""
+
+        # --- ARRANGE ---
+        config = AppConfig.model_validate({})
+        context = {"embedding": np.array([1.0, 0.0])}
+        linkless = [{'title': 'Article A', 'link': '', 'summary': 'No link'}]
+
+        for articles in ([], linkless):
+            # --- ACT ---
+            filtered = filter_articles(articles, context, config)
+
+            # --- ASSERT ---
+            self.assertEqual(filtered, [])
+        mock_get_model.assert_not_called()
+
+    @patch('src.legatus_ai.vigil._get_embedding_model')
+    def test_cached_embeddings_are_not_recomputed(self, mock_get_model):
+        """Tests that articles embedded in a previous run are served from the cache."""
+
+        # --- ARRANGE ---
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(close_embedding_cache)
+        cache_path = Path(temp_dir.name) / "article_embeddings.db"
+
+        mock_get_model.return_value.encode.return_value = _unit_embeddings([0.8, 0.2])
+        articles = [
+            {'title': 'Relevant Article', 'link': 'http://a.com', 'summary': '...'},
+            {'title': 'Irrelevant Article', 'link': 'http://b.com', 'summary': '...'}
+        ]
+        mock_context = {"embedding": np.array([1.0, 0.0])}
+        mock_config = AppConfig.model_validate({
+            "analysis_rules": {"vigil_similarity_threshold": 0.4}
+        })
+
+        # --- ACT ---
+        first_run = filter_articles(articles, mock_context, mock_config, cache_path)
+        mock_get_model.reset_mock()
+        second_run = filter_articles(articles, mock_context, mock_config, cache_path)
+
+        # --- ASSERT ---
+        self.assertEqual([a['link'] for a in first_run], ['http://a.com'])
+        self.assertEqual([a['link'] for a in second_run], ['http://a.com'])
+        self.assertEqual(first_run[0]['relevance_score'], second_run[0]['relevance_score'])
+        # Embeddings are stored as int8, which only perturbs the score slightly.
+        self.assertAlmostEqual(first_run[0]['relevance_score'], 0.8, places=2)
+        # Every article was cached, so the model was not even loaded.
+        mock_get_model.assert_not_called()
+
+    @patch('src.legatus_ai.vigil.SentenceTransformer')
+    def test_quantized_backend_falls_back_to_torch(self, mock_sentence_transformer):
+        """Tests that a backend that cannot be loaded falls back to the PyTorch model."""
+
+        # --- ARRANGE ---
+        torch_model = MagicMock()
+        mock_sentence_transformer.side_effect = [ImportError("optimum is not installed"), torch_model]
+
+        # --- ACT ---
+        model = _get_embedding_model("mock-model-name", "onnx")
+
+        # --- ASSERT ---
+        self.assertIs(model, torch_model)
+        first_call, second_call = mock_sentence_transformer.call_args_list
+        self.assertEqual(first_call.kwargs['backend'], "onnx")
+        self.assertEqual(first_call.kwargs['model_kwargs'], {"file_name": "onnx/model_qint8_avx512_vnni.onnx"})
+        self.assertEqual(second_call.args, ("mock-model-name",))
+
+        # The fallback is cached for the requested backend, so it is not retried.
+        self.assertIs(_get_embedding_model("mock-model-name", "onnx"), torch_model)
+        self.assertEqual(mock_sentence_transformer.call_count, 2)
+
+    @patch('src.legatus_ai.vigil.SentenceTransformer')
+    def test_embedding_dtype_is_passed_to_model(self, mock_sentence_transformer):
+        """Tests that a configured weight dtype is used when loading the PyTorch model."""
+
+        # --- ACT ---
+        _get_embedding_model("mock-model-name", "torch", None, "bfloat16")
 
+        # --- ASSERT ---
+        model_kwargs = mock_sentence_transformer.call_args.kwargs['model_kwargs']
+        self.assertIs(model_kwargs['dtype'], torch.bfloat16)
+
+    @patch('src.legatus_ai.vigil.SentenceTransformer')
+    def test_concurrent_callers_load_the_model_once(self, mock_sentence_transformer):
+        """Tests that threads racing on a cold cache share a single model load."""
+
+        # --- ARRANGE ---
+        barrier = threading.Barrier(4)
+        models = []
+
+        def load():
+            barrier.wait()
+            models.append(_get_embedding_model("mock-model-name"))
+
+        threads = [threading.Thread(target=load) for _ in range(4)]
+
+        # --- ACT ---
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # --- ASSERT ---
+        mock_sentence_transformer.assert_called_once()
+        self.assertEqual(len(models), 4)
+        self.assertTrue(all(model is models[0] for model in models))
+
+    @patch('src.legatus_ai.vigil.torch.set_num_threads')
+    def test_torch_threads_can_be_overridden(self, mock_set_num_threads):
+        """Tests that the embedding thread count honours LEGATUS_TORCH_THREADS."""
+
+        # --- ACT ---
+        with patch.dict(os.environ, {"LEGATUS_TORCH_THREADS": "3"}):
+            configure_torch_threads()
+        with patch.dict(os.environ, {"LEGATUS_TORCH_THREADS": "many"}), patch('os.cpu_count', return_value=64):
+            configure_torch_threads()
+
+        # --- ASSERT ---
+        # An invalid value falls back to the default, which is capped at 8 threads.
+        self.assertEqual([c.args[0] for c in mock_set_num_threads.call_args_list], [3, 8])
 
 if __name__ == '__main__':
     unittest.main()